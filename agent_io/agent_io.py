@@ -198,6 +198,8 @@ def _create_agent_from_dict(config: dict) -> BaseAgent:
     # Handle model - convert string model names to LiteLlm objects
     if "model" in agent_args and isinstance(agent_args["model"], str):
         from google.adk.models.lite_llm import LiteLlm
+        from utils.http_pool import configure_litellm_http_pool
+        configure_litellm_http_pool()
         model_name = agent_args["model"]
         agent_args["model"] = LiteLlm(model=model_name)
 
@@ -15,6 +15,7 @@ Main components:
 - SuggestionGenerator: Generates improvement suggestions
 - PromptUpdater: Updates agent configurations
 - TraceExtractor: Extracts execution traces
+- SemanticResponseCache: Reuses LLM responses for near-duplicate prompts
 """
 
 from .optimizer import AgentOptimizer
@@ -23,6 +24,7 @@ from .critic import OutputEvaluator
 from .suggester import SuggestionGenerator
 from .updater import PromptUpdater
 from .trace import TraceExtractor
+from .semantic_cache import SemanticResponseCache
 from .types import (
     OptimizationInput,
     OptimizationResult,
@@ -48,6 +50,7 @@ __all__ = [
     'SuggestionGenerator',
     'PromptUpdater',
     'TraceExtractor',
+    'SemanticResponseCache',
     'OptimizationInput',
     'OptimizationResult',
     'OptimizationConfig',
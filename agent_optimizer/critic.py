@@ -2,8 +2,12 @@
 Output Evaluator/Critic Agent - Compares actual vs expected outputs and provides feedback.
 """
 
+import asyncio
 import json
 import logging
+import math
+import operator
+import statistics
 import traceback
 from typing import Dict, Any, List, Optional
 from dataclasses import asdict
@@ -85,13 +89,52 @@ class OutputEvaluator:
                 metrics=asdict(ScoringMetrics())
             )
     
+    async def evaluate_outputs(
+        self,
+        actual_outputs: List[str],
+        input_output_pairs: List[InputOutputPair],
+        objective: OptimizationObjective = OptimizationObjective.ACCURACY,
+        agent_traces: Optional[List[Dict[str, Any]]] = None,
+        max_concurrency: int = 4
+    ) -> List[EvaluationResult]:
+        """
+        Evaluate each output against its expected output, running the LLM calls concurrently.
+        
+        Args:
+            actual_outputs: List of actual outputs from the workflow
+            input_output_pairs: List of input-output pairs with expected outputs
+            objective: The optimization objective to focus on
+            agent_traces: Optional traces from individual agents for each pair
+            max_concurrency: Maximum number of evaluation calls in flight at once
+            
+        Returns:
+            List of EvaluationResult objects in pair order
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def evaluate_pair(i: int, actual_output: str, pair: InputOutputPair) -> EvaluationResult:
+            traces_for_pair = agent_traces[i] if agent_traces and i < len(agent_traces) else None
+            async with semaphore:
+                return await self.evaluate_output(
+                    actual_output=actual_output,
+                    expected_output=pair.expected_output,
+                    objective=objective,
+                    agent_traces=traces_for_pair
+                )
+        
+        return await asyncio.gather(*(
+            evaluate_pair(i, actual_output, pair)
+            for i, (actual_output, pair) in enumerate(zip(actual_outputs, input_output_pairs))
+        ))
+    
     async def evaluate_multiple_outputs(
         self,
         actual_outputs: List[str],
         input_output_pairs: List[InputOutputPair],
         objective: OptimizationObjective = OptimizationObjective.ACCURACY,
         aggregation_strategy: AggregationStrategy = AggregationStrategy.AVERAGE,
-        agent_traces: Optional[List[Dict[str, Any]]] = None
+        agent_traces: Optional[List[Dict[str, Any]]] = None,
+        individual_evaluations: Optional[List[EvaluationResult]] = None
     ) -> EvaluationResult:
         """
         Evaluate multiple actual outputs against their expected outputs.
@@ -102,6 +145,8 @@ class OutputEvaluator:
             objective: The optimization objective to focus on
             aggregation_strategy: How to aggregate scores across pairs
             agent_traces: Optional traces from individual agents for each pair
+            individual_evaluations: Per-pair results that were already computed; when
+                                    given, they are aggregated without new LLM calls
             
         Returns:
             EvaluationResult with aggregated score and feedback
@@ -110,18 +155,15 @@ class OutputEvaluator:
             raise ValueError(f"Mismatch: {len(actual_outputs)} outputs vs {len(input_output_pairs)} pairs")
         
         try:
-            # Evaluate each pair individually
-            individual_results = []
-            for i, (actual_output, pair) in enumerate(zip(actual_outputs, input_output_pairs)):
-                traces_for_pair = agent_traces[i] if agent_traces and i < len(agent_traces) else None
-                
-                result = await self.evaluate_output(
-                    actual_output=actual_output,
-                    expected_output=pair.expected_output,
-                    objective=objective,
-                    agent_traces=traces_for_pair
+            # Evaluate each pair individually unless the caller already did
+            if individual_evaluations is None:
+                individual_evaluations = await self.evaluate_outputs(
+                    actual_outputs, input_output_pairs, objective, agent_traces
                 )
-                individual_results.append((result, pair.weight))
+            individual_results = [
+                (result, pair.weight)
+                for result, pair in zip(individual_evaluations, input_output_pairs)
+            ]
             
             # Aggregate scores based on strategy
             aggregated_score = self._aggregate_scores(
@@ -430,18 +472,16 @@ class OutputEvaluator:
         if not score_weight_pairs:
             return 0.0
         
-        scores = [score for score, weight in score_weight_pairs]
-        weights = [weight for score, weight in score_weight_pairs]
+        scores, weights = zip(*score_weight_pairs)
         
         if strategy == AggregationStrategy.AVERAGE:
-            return sum(scores) / len(scores)
+            return statistics.fmean(scores)
         
         elif strategy == AggregationStrategy.WEIGHTED_AVERAGE:
-            total_weight = sum(weights)
+            total_weight = math.fsum(weights)
             if total_weight == 0:
-                return sum(scores) / len(scores)  # Fall back to simple average
-            weighted_sum = sum(score * weight for score, weight in score_weight_pairs)
-            return weighted_sum / total_weight
+                return statistics.fmean(scores)  # Fall back to simple average
+            return math.fsum(map(operator.mul, scores, weights)) / total_weight
         
         elif strategy == AggregationStrategy.MIN:
             return min(scores)
@@ -450,16 +490,11 @@ class OutputEvaluator:
             return max(scores)
         
         elif strategy == AggregationStrategy.MEDIAN:
-            sorted_scores = sorted(scores)
-            n = len(sorted_scores)
-            if n % 2 == 0:
-                return (sorted_scores[n//2 - 1] + sorted_scores[n//2]) / 2
-            else:
-                return sorted_scores[n//2]
+            return statistics.median(scores)
         
         else:
             logger.warning(f"Unknown aggregation strategy: {strategy}, using average")
-            return sum(scores) / len(scores)
+            return statistics.fmean(scores)
     
     # Aggregate metrics only use average now for simplicity.
     def _aggregate_metrics(self, metrics_list: List[Dict[str, float]]) -> Dict[str, float]:
@@ -467,18 +502,17 @@ class OutputEvaluator:
         if not metrics_list:
             return asdict(ScoringMetrics())
         
-        # Calculate averages for each metric
-        aggregated = {}
-        
-        # Get all metric keys from first non-empty result
-        all_keys = set()
+        # Sum every metric in one pass; a key missing from a non-empty result counts as 0.0
+        totals: Dict[str, float] = {}
+        counted = 0
         for metrics in metrics_list:
-            if metrics:
-                all_keys.update(metrics.keys())
-        
-        for key in all_keys:
-            values = [metrics.get(key, 0.0) for metrics in metrics_list if metrics]
-            aggregated[key] = sum(values) / len(values) if values else 0.0
-        
-        return aggregated
+            if not metrics:
+                continue
+            counted += 1
+            for key, value in metrics.items():
+                totals[key] = totals.get(key, 0.0) + value
+        
+        if not counted:
+            return {}
+        return {key: total / counted for key, total in totals.items()}
     
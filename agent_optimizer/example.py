@@ -14,6 +14,12 @@ import logging
 from pathlib import Path
 import yaml
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 from agent_optimizer import (
     AgentOptimizer,
     OptimizationInput,
@@ -153,6 +159,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Run the main example
-    asyncio.run(main())
-    
\ No newline at end of file
+    # Run the main example, on libuv's event loop when uvloop is installed
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
+    
@@ -8,16 +8,56 @@ Google ADK agent execution.
 
 import asyncio
 import logging
-from typing import Optional
+import random
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 # Google ADK imports following core/*.py patterns
 from google.adk.agents import Agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner, types
 from google.adk.sessions import InMemorySessionService
 from google.adk.models.lite_llm import LiteLlm
 
+from utils.http_pool import configure_litellm_http_pool
+
 logger = logging.getLogger(__name__)
 
+# Rate limits and 5xx responses are usually gone within seconds, so retry them in
+# place with exponential backoff and jitter instead of failing the whole iteration
+try:
+    from litellm.exceptions import (
+        APIConnectionError, InternalServerError, RateLimitError, ServiceUnavailableError, Timeout
+    )
+    _TRANSIENT_ERRORS = (
+        RateLimitError, InternalServerError, ServiceUnavailableError, APIConnectionError, Timeout
+    )
+except ImportError:
+    _TRANSIENT_ERRORS = ()
+
+_TRANSIENT_RETRY_ATTEMPTS = 3
+_TRANSIENT_RETRY_INITIAL_DELAY = 0.5
+_TRANSIENT_RETRY_MAX_DELAY = 8.0
+
+
+async def _retry_transient(call: Callable[[], Awaitable[str]], description: str) -> str:
+    """Await call(), retrying transient LLM errors with exponential backoff and jitter."""
+    for attempt in range(1, _TRANSIENT_RETRY_ATTEMPTS + 1):
+        try:
+            return await call()
+        except _TRANSIENT_ERRORS as e:
+            if attempt == _TRANSIENT_RETRY_ATTEMPTS:
+                raise
+            delay = min(
+                _TRANSIENT_RETRY_INITIAL_DELAY * 2 ** (attempt - 1) + random.uniform(0, _TRANSIENT_RETRY_INITIAL_DELAY),
+                _TRANSIENT_RETRY_MAX_DELAY
+            )
+            logger.warning(
+                f"Transient error in {description} (attempt {attempt}/{_TRANSIENT_RETRY_ATTEMPTS}), "
+                f"retrying in {delay:.1f}s: {str(e)}"
+            )
+            await asyncio.sleep(delay)
+
+
 async def call_evaluation_agent(
     evaluation_prompt: str,
     system_instruction: str,
@@ -35,6 +75,9 @@ async def call_evaluation_agent(
         Response text from the agent
     """
     try:
+        # Reuse pooled provider connections on this event loop
+        configure_litellm_http_pool()
+        
         # Create agent following core/*.py patterns
         agent = Agent(
             name="EvaluationAgent",
@@ -61,7 +104,7 @@ async def call_evaluation_agent(
         message = types.Content(role="user", parts=[{"text": evaluation_prompt}])
         
         # Run agent following established pattern
-        response_generator = runner.run(
+        response_generator = runner.run_async(
             user_id='optimizer',
             session_id='evaluation_session',
             new_message=message
@@ -69,7 +112,7 @@ async def call_evaluation_agent(
         
         # Extract response following flexible_agents.py pattern
         response_text = ""
-        for event in response_generator:
+        async for event in response_generator:
             if hasattr(event, 'content') and event.content:
                 if event.is_final_response():
                     for part in event.content.parts:
@@ -99,53 +142,171 @@ async def call_suggestion_agent(
         Response text from the agent
     """
     try:
-        # Create agent following core/*.py patterns
-        agent = Agent(
-            name="SuggestionAgent",
-            model=LiteLlm(model=model_name),
-            instruction=system_instruction
-        )
-        
-        # Use established session management pattern
-        session_service = InMemorySessionService()
-        runner = Runner(
-            app_name='AgentOptimizer',
-            agent=agent,
-            session_service=session_service
-        )
-        
-        # Create session
-        session = await session_service.create_session(
-            user_id='optimizer',
-            session_id='suggestion_session',
-            app_name='AgentOptimizer'
-        )
-        
-        # Create message following types.Content pattern
-        message = types.Content(role="user", parts=[{"text": suggestion_prompt}])
-        
-        # Run agent following established pattern
-        response_generator = runner.run(
-            user_id='optimizer',
-            session_id='suggestion_session',
-            new_message=message
+        return await _retry_transient(
+            lambda: _run_suggestion_agent(suggestion_prompt, system_instruction, model_name),
+            "suggestion agent"
         )
         
-        # Extract response following flexible_agents.py pattern
-        response_text = ""
-        for event in response_generator:
-            if hasattr(event, 'content') and event.content:
-                if event.is_final_response():
-                    for part in event.content.parts:
-                        if hasattr(part, "text") and part.text:
-                            response_text += part.text
-        
-        return response_text
-        
     except Exception as e:
         logger.error(f"Error in suggestion agent: {str(e)}")
         return ""
 
+async def _run_suggestion_agent(
+    suggestion_prompt: str,
+    system_instruction: str,
+    model_name: str
+) -> str:
+    """Run the suggestion agent once and return its final response text."""
+    # Reuse pooled provider connections on this event loop
+    configure_litellm_http_pool()
+    
+    # Create agent following core/*.py patterns
+    agent = Agent(
+        name="SuggestionAgent",
+        model=LiteLlm(model=model_name),
+        instruction=system_instruction
+    )
+    
+    # Use established session management pattern
+    session_service = InMemorySessionService()
+    runner = Runner(
+        app_name='AgentOptimizer',
+        agent=agent,
+        session_service=session_service
+    )
+    
+    # Create session
+    session = await session_service.create_session(
+        user_id='optimizer',
+        session_id='suggestion_session',
+        app_name='AgentOptimizer'
+    )
+    
+    # Create message following types.Content pattern
+    message = types.Content(role="user", parts=[{"text": suggestion_prompt}])
+    
+    # Run agent following established pattern
+    response_generator = runner.run_async(
+        user_id='optimizer',
+        session_id='suggestion_session',
+        new_message=message
+    )
+    
+    # Extract response following flexible_agents.py pattern
+    response_text = ""
+    async for event in response_generator:
+        if hasattr(event, 'content') and event.content:
+            if event.is_final_response():
+                for part in event.content.parts:
+                    if hasattr(part, "text") and part.text:
+                        response_text += part.text
+    
+    return response_text
+
+async def call_suggestion_agent_stream(
+    suggestion_prompt: str,
+    system_instruction: str,
+    model_name: str = "openai/gpt-4o"
+) -> AsyncIterator[str]:
+    """
+    Stream a suggestion generation agent's response using Google ADK patterns.
+    
+    Transient errors before the first chunk are retried with the same backoff as
+    call_suggestion_agent. Errors after that, and non-transient errors, propagate
+    to the caller so a failed call is not mistaken for a short response.
+    
+    Args:
+        suggestion_prompt: The suggestion generation prompt
+        system_instruction: System instruction for the agent
+        model_name: Model to use (respects the model_name parameter)
+        
+    Yields:
+        Response text chunks as the model generates them. Models that do not
+        stream yield the whole response as a single chunk.
+    """
+    chunks = None
+    
+    async def open_stream() -> Optional[str]:
+        """Start a fresh stream and return its first chunk (None if it is empty)."""
+        nonlocal chunks
+        chunks = _stream_suggestion_agent(suggestion_prompt, system_instruction, model_name)
+        try:
+            return await chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+        except BaseException:
+            await chunks.aclose()
+            raise
+    
+    first_chunk = await _retry_transient(open_stream, "streaming suggestion agent")
+    try:
+        if first_chunk is None:
+            return
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        # Closes the ADK run as well when the caller stops reading early
+        await chunks.aclose()
+
+async def _stream_suggestion_agent(
+    suggestion_prompt: str,
+    system_instruction: str,
+    model_name: str
+) -> AsyncIterator[str]:
+    """Run the suggestion agent once in streaming mode and yield its text chunks."""
+    # Reuse pooled provider connections on this event loop
+    configure_litellm_http_pool()
+    
+    # Create agent following core/*.py patterns
+    agent = Agent(
+        name="SuggestionAgent",
+        model=LiteLlm(model=model_name),
+        instruction=system_instruction
+    )
+    
+    # Use established session management pattern
+    session_service = InMemorySessionService()
+    runner = Runner(
+        app_name='AgentOptimizer',
+        agent=agent,
+        session_service=session_service
+    )
+    
+    # Create session
+    session = await session_service.create_session(
+        user_id='optimizer',
+        session_id='suggestion_stream_session',
+        app_name='AgentOptimizer'
+    )
+    
+    # Create message following types.Content pattern
+    message = types.Content(role="user", parts=[{"text": suggestion_prompt}])
+    
+    events = runner.run_async(
+        user_id='optimizer',
+        session_id='suggestion_stream_session',
+        new_message=message,
+        run_config=RunConfig(streaming_mode=StreamingMode.SSE)
+    )
+    
+    # Partial events carry the incremental text; the final event repeats all of it
+    streamed = False
+    try:
+        async for event in events:
+            if not (hasattr(event, 'content') and event.content):
+                continue
+            if event.partial:
+                streamed = True
+            elif streamed or not event.is_final_response():
+                continue
+            for part in event.content.parts:
+                if hasattr(part, "text") and part.text:
+                    yield part.text
+    finally:
+        # Cancel the in-flight model request if our caller stops early
+        await events.aclose()
+
 async def call_generic_llm_agent(
     prompt: str,
     system_instruction: str,
@@ -165,6 +326,9 @@ async def call_generic_llm_agent(
         Response text from the agent
     """
     try:
+        # Reuse pooled provider connections on this event loop
+        configure_litellm_http_pool()
+        
         # Create agent following core/*.py patterns
         agent = Agent(
             name=agent_name,
@@ -191,7 +355,7 @@ async def call_generic_llm_agent(
         message = types.Content(role="user", parts=[{"text": prompt}])
         
         # Run agent following established pattern
-        response_generator = runner.run(
+        response_generator = runner.run_async(
             user_id='optimizer',
             session_id='generic_session',
             new_message=message
@@ -199,7 +363,7 @@ async def call_generic_llm_agent(
         
         # Extract response following flexible_agents.py pattern
         response_text = ""
-        for event in response_generator:
+        async for event in response_generator:
             if hasattr(event, 'content') and event.content:
                 if event.is_final_response():
                     for part in event.content.parts:
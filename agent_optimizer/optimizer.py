@@ -170,23 +170,22 @@ class AgentOptimizer:
                 while current_iteration_retries < optimization_input.config.max_llm_retries_per_iteration:
                     try:
                         # Evaluate each pair individually for detailed feedback (LLM dependent)
-                        individual_evaluations = []
-                        for i, pair in enumerate(optimization_input.input_output_pairs):
-                            individual_eval = await self.evaluator.evaluate_output(
-                                actual_output=outputs[i],
-                                expected_output=pair.expected_output,
-                                objective=optimization_input.config.optimization_objective,
-                                agent_traces=processed_traces[i] if processed_traces and i < len(processed_traces) else None
-                            )
-                            individual_evaluations.append(individual_eval)
+                        individual_evaluations = await self.evaluator.evaluate_outputs(
+                            actual_outputs=outputs,
+                            input_output_pairs=optimization_input.input_output_pairs,
+                            objective=optimization_input.config.optimization_objective,
+                            agent_traces=processed_traces if processed_traces else None,
+                            max_concurrency=optimization_input.config.max_concurrent_evaluations
+                        )
                         
-                        # Evaluate outputs using multiple pairs for aggregated score (LLM dependent)
+                        # Aggregate the per-pair evaluations (no further LLM calls)
                         evaluation_result = await self.evaluator.evaluate_multiple_outputs(
                             actual_outputs=outputs,
                             input_output_pairs=optimization_input.input_output_pairs,
                             objective=optimization_input.config.optimization_objective,
                             aggregation_strategy=optimization_input.config.aggregation_strategy,
-                            agent_traces=processed_traces if processed_traces else None
+                            agent_traces=processed_traces if processed_traces else None,
+                            individual_evaluations=individual_evaluations
                         )
                         
                         # If we need suggestions, generate them (LLM dependent) 
@@ -2,24 +2,210 @@
 Agent Workflow Runner - Executes ADK-style agent workflows with tracing support.
 """
 
+import asyncio
+import copy
+import hashlib
+import io
 import json
 import logging
+import os
+import re
 import time
-from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Tuple, Union
 import yaml
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ittapi
+    ITTAPI_AVAILABLE = True
+except ImportError:
+    ITTAPI_AVAILABLE = False
+
 from core.flexible_agents import main_async_with_config
 from .types import WorkflowTrace, AgentTrace
 
 logger = logging.getLogger(__name__)
 
+# Header flexible_agents prepends to each final response:
+# "AgentName %% (2023-01-01T12:00:00): actual content"
+_RESPONSE_HEADER_RE = re.compile(r' %% \((.*?)\): ', re.S)
+
+# Sentinel for single-lookup dict probes where None is a meaningful value
+_MISSING = object()
+
+# Default configurations used when run_workflow is called without explicit
+# job/template configs. Built once at import time and treated as read-only.
+_DEFAULT_JOB_CONFIG: Dict[str, Any] = {
+    "job_name": "AgentOptimizationRun",
+    "job_description": "Optimization run for agent workflow",
+    "job_type": "optimization",
+    "runner_config": {
+        "app_name": "AgentOptimization",
+        "session_config": {
+            "user_id": "optimizer",
+            "session_id": "optimization_session"
+        }
+    },
+    "agent_config": {
+        "config_type": "content"
+    },
+    "input_config": {
+        "input_files": [],
+        "preview_length": 1000
+    },
+    "analysis_config": {
+        "template_config_content": {}
+    },
+    "output_config": {
+        "output_directory": "output",
+        "output_format": ["json"],
+        "file_naming": "optimization_run_{timestamp}",
+        "timestamp_format": "%Y%m%d_%H%M%S",
+        "include_metadata": True
+    },
+    "execution_config": {
+        "track_execution_steps": True,
+        "display_progress": False,
+        "log_level": "INFO",
+        "error_handling": "continue_on_agent_failure",
+        "timeout_seconds": 300
+    },
+    "report_config": {
+        "include_final_responses": True,
+        "include_code_preview": False,
+        "include_execution_summary": True,
+        "display_results_summary": False
+    }
+}
+
+_DEFAULT_TEMPLATE_CONFIG: Dict[str, Any] = {
+    "template_name": "optimization_template",
+    "template_description": "Template for optimization runs",
+    "user_query_template": "{{input_data}}",
+    "variables": {
+        "input_data": "Please analyze the following input data."
+    }
+}
+
+# The defaults never change, so their YAML is also produced once at import
+_DEFAULT_JOB_CONFIG_YAML = yaml.safe_dump(_DEFAULT_JOB_CONFIG, default_flow_style=False)
+_DEFAULT_TEMPLATE_CONFIG_YAML = yaml.safe_dump(_DEFAULT_TEMPLATE_CONFIG, default_flow_style=False)
+
+# Intel ITT task markers let VTune attribute time to each stage of a run.
+# Opt in with AGENT_OPTIMIZER_ITT=1; otherwise the markers are no-ops.
+_ITT_DOMAIN = 'agent_optimizer.runner'
+_ITT_ENABLED = ITTAPI_AVAILABLE and os.environ.get('AGENT_OPTIMIZER_ITT') == '1'
+
+
+def _itt_task(name: str):
+    """Return a context manager marking an ITT task, or a no-op when disabled."""
+    if not _ITT_ENABLED:
+        return nullcontext()
+    return ittapi.task(name, domain=_ITT_DOMAIN)
+
+
+# Trace of the workflow run executing in the current async context. Each
+# asyncio task gets its own value, so concurrent runs never see each other's trace.
+_current_trace: ContextVar[Optional[WorkflowTrace]] = ContextVar('current_trace', default=None)
+
+# Serialized YAML keyed by a type-preserving structural key of the config, so
+# configs reused across optimization runs are only dumped to YAML once.
+_YAML_CACHE_MAX_ENTRIES = 64
+_yaml_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
+# Exact scalar types a YAML cache key may contain; subclasses (e.g. enums) are not cached
+_YAML_CACHE_SCALAR_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def _config_fingerprint(config: Dict[str, Any]) -> Union[bytes, str]:
+    """Build a canonical, key-sorted JSON fingerprint of a configuration."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(config, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(config, sort_keys=True)
+
+
+def _yaml_cache_key(value: Any) -> tuple:
+    """
+    Build a hashable key that keeps every value's type, so 1 and '1' never share an entry.
+    
+    Raises:
+        TypeError: If the value contains anything other than dicts, lists and plain scalars
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return (dict, tuple((_yaml_cache_key(k), _yaml_cache_key(v)) for k, v in value.items()))
+    if value_type is list:
+        return (list, tuple(_yaml_cache_key(item) for item in value))
+    if value_type is float:
+        # repr keeps -0.0 apart from 0.0 and makes NaN equal to itself
+        return (float, repr(value))
+    if value_type in _YAML_CACHE_SCALAR_TYPES:
+        return (value_type, value)
+    raise TypeError(f"Uncacheable config value of type {value_type.__name__}")
+
+
+def _dump_config_yaml(config: Dict[str, Any]) -> str:
+    """Serialize a configuration to YAML, reusing cached text for identical configs."""
+    try:
+        key = _yaml_cache_key(config)
+    except TypeError:
+        # Not plain data (e.g. dates); serialize without caching
+        return yaml.safe_dump(config, default_flow_style=False)
+    
+    config_yaml = _yaml_cache.get(key)
+    if config_yaml is None:
+        config_yaml = yaml.safe_dump(config, default_flow_style=False)
+        _yaml_cache[key] = config_yaml
+        if len(_yaml_cache) > _YAML_CACHE_MAX_ENTRIES:
+            _yaml_cache.popitem(last=False)
+    else:
+        _yaml_cache.move_to_end(key)
+    return config_yaml
+
 
 class WorkflowRunner:
     """Executes agent workflows with optional tracing and debugging."""
     
-    def __init__(self, enable_tracing: bool = True):
+    def __init__(
+        self,
+        enable_tracing: bool = True,
+        enable_result_cache: bool = False,
+        result_cache_size: int = 256
+    ):
+        """
+        Args:
+            enable_tracing: Whether to build a WorkflowTrace for each run
+            enable_result_cache: Reuse (output, trace) for repeated runs with identical
+                                 configs and input. Leave disabled for workflows whose
+                                 agents have side effects or non-deterministic output.
+                                 Hits share the cached output string; each hit gets its
+                                 own trace holding a copy of the cached agent traces.
+            result_cache_size: Maximum number of cached results (LRU eviction)
+        """
         self.enable_tracing = enable_tracing
-        self.current_trace = None
+        self.enable_result_cache = enable_result_cache
+        self.result_cache_size = result_cache_size
+        self._result_cache: "OrderedDict[bytes, Tuple[str, Optional[WorkflowTrace]]]" = OrderedDict()
+        # Trace of the most recently started run; kept after the run finishes
+        self.last_trace: Optional[WorkflowTrace] = None
+    
+    @property
+    def current_trace(self) -> Optional[WorkflowTrace]:
+        """
+        Trace of the run executing in the current async context, if any.
+        
+        Read-only, and None once run_workflow returns. Use last_trace (or the
+        trace returned by run_workflow) to inspect a finished run.
+        """
+        return _current_trace.get()
     
     async def run_workflow(
         self,
@@ -40,11 +226,29 @@ class WorkflowRunner:
         Returns:
             Tuple of (output_string, trace_object)
         """
-        start_time = time.time()
-        
-        if self.enable_tracing:
-            self.current_trace = WorkflowTrace()
+        start_time = time.perf_counter()
         
+        trace = WorkflowTrace() if self.enable_tracing else None
+        self.last_trace = trace
+        trace_token = _current_trace.set(trace)
+        try:
+            with _itt_task('run_workflow'):
+                return await self._run_workflow(
+                    agent_config, input_data, job_config, template_config, trace, start_time
+                )
+        finally:
+            _current_trace.reset(trace_token)
+    
+    async def _run_workflow(
+        self,
+        agent_config: Dict[str, Any],
+        input_data: Any,
+        job_config: Optional[Dict[str, Any]],
+        template_config: Optional[Dict[str, Any]],
+        trace: Optional[WorkflowTrace],
+        start_time: float
+    ) -> Tuple[str, Optional[WorkflowTrace]]:
+        """Run a single workflow, recording results into the given trace."""
         # Create default configurations if not provided
         if job_config is None:
             job_config = self._create_default_job_config()
@@ -56,171 +260,248 @@ class WorkflowRunner:
         if isinstance(input_data, dict):
             job_config = self._merge_input_config_with_job_config(job_config, input_data)
         
+        cache_key = None
+        if self.enable_result_cache:
+            cache_key = self._result_cache_key(agent_config, input_data, job_config, template_config)
+            cached = self._result_cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                logger.info("Reusing cached workflow result")
+                output, cached_trace = cached
+                # Fill this run's own trace so callers never share the cached one
+                if trace and cached_trace:
+                    trace.agent_traces = copy.deepcopy(cached_trace.agent_traces)
+                    trace.final_output = output
+                    trace.total_execution_time = time.perf_counter() - start_time
+                return output, trace
+        
         try:
             # Convert configurations to YAML strings
-            agent_config_yaml = yaml.dump(agent_config, default_flow_style=False)
-            job_config_yaml = yaml.dump(job_config, default_flow_style=False)
-            template_config_yaml = yaml.dump(template_config, default_flow_style=False)
+            with _itt_task('yaml_dump_agent'):
+                agent_config_yaml = _dump_config_yaml(agent_config)
+            with _itt_task('yaml_dump_job'):
+                if job_config is _DEFAULT_JOB_CONFIG:
+                    job_config_yaml = _DEFAULT_JOB_CONFIG_YAML
+                else:
+                    job_config_yaml = _dump_config_yaml(job_config)
+            with _itt_task('yaml_dump_template'):
+                if template_config is _DEFAULT_TEMPLATE_CONFIG:
+                    template_config_yaml = _DEFAULT_TEMPLATE_CONFIG_YAML
+                else:
+                    template_config_yaml = _dump_config_yaml(template_config)
             
             # Execute the workflow
-            exit_code, results = await main_async_with_config(
-                job_config_content=job_config_yaml,
-                agent_config_content=agent_config_yaml,
-                template_config_content=template_config_yaml,
-                uuid="optimization_run"
-            )
+            with _itt_task('main_async_with_config'):
+                exit_code, results = await main_async_with_config(
+                    job_config_content=job_config_yaml,
+                    agent_config_content=agent_config_yaml,
+                    template_config_content=template_config_yaml,
+                    uuid="optimization_run"
+                )
             
             # Extract output
             if exit_code == 0 and results:
-                output = self._extract_output_from_results(results)
+                with _itt_task('extract_output'):
+                    output = self._extract_output_from_results(results)
                 
                 # Complete trace if enabled
-                if self.enable_tracing and self.current_trace:
-                    self.current_trace.total_execution_time = time.time() - start_time
-                    self.current_trace.final_output = output
+                if trace:
+                    trace.total_execution_time = time.perf_counter() - start_time
+                    trace.final_output = output
                     # TODO: Extract individual agent traces from results
-                    self._extract_agent_traces_from_results(results)
+                    with _itt_task('extract_agent_traces'):
+                        self._extract_agent_traces_from_results(results, trace)
+                
+                if cache_key is not None:
+                    self._store_cached_result(cache_key, (output, copy.deepcopy(trace)))
                 
-                return output, self.current_trace
+                return output, trace
             else:
+                # The returned message is consumed by callers, so it is always
+                # formatted; the log record itself uses lazy % arguments
                 error_msg = f"Workflow execution failed with exit code {exit_code}"
                 if results and isinstance(results, dict):
-                    error_msg += f": {results.get('error_message', 'Unknown error')}"
+                    error_detail = results.get('error_message', 'Unknown error')
+                    error_msg += f": {error_detail}"
+                    logger.error("Workflow execution failed with exit code %s: %s", exit_code, error_detail)
+                else:
+                    logger.error("Workflow execution failed with exit code %s", exit_code)
                 
-                logger.error(error_msg)
-                return error_msg, self.current_trace
+                return error_msg, trace
                 
         except Exception as e:
-            error_msg = f"Error executing workflow: {str(e)}"
-            logger.error(error_msg)
-            return error_msg, self.current_trace
+            logger.error("Error executing workflow: %s", e)
+            return f"Error executing workflow: {str(e)}", trace
+    
+    def _result_cache_key(
+        self,
+        agent_config: Dict[str, Any],
+        input_data: Any,
+        job_config: Dict[str, Any],
+        template_config: Dict[str, Any]
+    ) -> Optional[bytes]:
+        """Hash everything that determines a run's result; None if it can't be fingerprinted."""
+        try:
+            fingerprint = _config_fingerprint({
+                'agent_config': agent_config,
+                'input_data': input_data,
+                'job_config': job_config,
+                'template_config': template_config
+            })
+        except (TypeError, ValueError):
+            return None
+        
+        if isinstance(fingerprint, str):
+            fingerprint = fingerprint.encode('utf-8')
+        return hashlib.blake2b(fingerprint, digest_size=32).digest()
+    
+    def _store_cached_result(self, cache_key: bytes, result: Tuple[str, Optional[WorkflowTrace]]) -> None:
+        """Store a successful run's result, evicting the least recently used entry."""
+        self._result_cache[cache_key] = result
+        self._result_cache.move_to_end(cache_key)
+        if len(self._result_cache) > self.result_cache_size:
+            self._result_cache.popitem(last=False)
+    
+    def clear_result_cache(self) -> None:
+        """Drop all cached workflow results."""
+        self._result_cache.clear()
+    
+    async def run_workflows_batch(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 4
+    ) -> List[Tuple[str, Optional[WorkflowTrace]]]:
+        """
+        Execute several workflows concurrently, bounded by a semaphore.
+        
+        Args:
+            items: List of keyword-argument dicts for run_workflow
+                   (agent_config, input_data, job_config, template_config)
+            concurrency: Maximum number of workflows running at once
+            
+        Returns:
+            List of (output_string, trace_object) tuples in the order of items
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run_one(item: Dict[str, Any]) -> Tuple[str, Optional[WorkflowTrace]]:
+            async with semaphore:
+                return await self.run_workflow(**item)
+        
+        results = await asyncio.gather(
+            *(run_one(item) for item in items),
+            return_exceptions=True
+        )
+        
+        # Report failures in the same shape run_workflow uses for its own errors
+        batch_results = []
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error("Error executing workflow: %s", result)
+                batch_results.append((f"Error executing workflow: {str(result)}", None))
+            else:
+                batch_results.append(result)
+        
+        return batch_results
     
     def _create_default_job_config(self) -> Dict[str, Any]:
-        """Create a default job configuration."""
-        return {
-            "job_name": "AgentOptimizationRun",
-            "job_description": "Optimization run for agent workflow",
-            "job_type": "optimization",
-            "runner_config": {
-                "app_name": "AgentOptimization",
-                "session_config": {
-                    "user_id": "optimizer",
-                    "session_id": "optimization_session"
-                }
-            },
-            "agent_config": {
-                "config_type": "content"
-            },
-            "input_config": {
-                "input_files": [],
-                "preview_length": 1000
-            },
-            "analysis_config": {
-                "template_config_content": {}
-            },
-            "output_config": {
-                "output_directory": "output",
-                "output_format": ["json"],
-                "file_naming": "optimization_run_{timestamp}",
-                "timestamp_format": "%Y%m%d_%H%M%S",
-                "include_metadata": True
-            },
-            "execution_config": {
-                "track_execution_steps": True,
-                "display_progress": False,
-                "log_level": "INFO",
-                "error_handling": "continue_on_agent_failure",
-                "timeout_seconds": 300
-            },
-            "report_config": {
-                "include_final_responses": True,
-                "include_code_preview": False,
-                "include_execution_summary": True,
-                "display_results_summary": False
-            }
-        }
+        """
+        Return the default job configuration.
+        
+        The returned dict is shared across calls and must not be mutated;
+        callers that need to modify it should copy it first.
+        """
+        return _DEFAULT_JOB_CONFIG
     
     def _create_default_template_config(self) -> Dict[str, Any]:
-        """Create a default template configuration."""
-        return {
-            "template_name": "optimization_template",
-            "template_description": "Template for optimization runs",
-            "user_query_template": "{{input_data}}",
-            "variables": {
-                "input_data": "Please analyze the following input data."
-            }
-        }
+        """
+        Return the default template configuration.
+        
+        The returned dict is shared across calls and must not be mutated.
+        """
+        return _DEFAULT_TEMPLATE_CONFIG
     
     def _merge_input_config_with_job_config(self, job_config: Dict[str, Any], input_config: Dict[str, Any]) -> Dict[str, Any]:
         """Merge input_config with job_config."""
-        # Create a copy to avoid modifying original
-        updated_config = json.loads(json.dumps(job_config))
-        
-        # Update the input_config section
-        if 'input_config' not in updated_config:
-            updated_config['input_config'] = {}
+        # Only the input_config section is modified, so copy just the top level
+        # and that section instead of deep-copying the whole configuration
+        updated_config = dict(job_config)
+        merged_input_config = dict(updated_config.get('input_config') or {})
         
         # Merge the input_config from the input_data
-        updated_config['input_config'].update(input_config)
+        merged_input_config.update(input_config)
+        updated_config['input_config'] = merged_input_config
         
         return updated_config
     
     def _extract_output_from_results(self, results: Dict[str, Any]) -> str:
         """Extract the main output from workflow results."""
-        if 'execution_results' in results:
-            execution_results = results['execution_results']
+        execution_results = results.get('execution_results', _MISSING)
+        if execution_results is not _MISSING:
             if isinstance(execution_results, dict):
-                # Combine all agent outputs
-                outputs = []
+                # Combine all agent outputs into a single buffer
+                buffer = io.StringIO()
+                separator = ""
                 for agent_name, response in execution_results.items():
-                    if isinstance(response, str):
-                        outputs.append(f"[{agent_name}]\n{response}")
-                    else:
-                        outputs.append(f"[{agent_name}]\n{str(response)}")
-                return "\n\n".join(outputs)
+                    buffer.write(separator)
+                    buffer.write("[")
+                    buffer.write(agent_name)
+                    buffer.write("]\n")
+                    buffer.write(response if type(response) is str else str(response))
+                    separator = "\n\n"
+                return buffer.getvalue()
             else:
                 return str(execution_results)
         
         # Fallback to string representation of results
         return str(results)
     
-    def _extract_agent_traces_from_results(self, results: Dict[str, Any]) -> None:
-        """Extract individual agent traces from workflow results."""
-        if not self.current_trace:
+    def _extract_agent_traces_from_results(self, results: Dict[str, Any], trace: Optional[WorkflowTrace]) -> None:
+        """Extract individual agent traces from workflow results into the given trace."""
+        if not trace:
             return
         
         # Extract execution results
         execution_results = results.get('execution_results', {})
         
-        for agent_name, output in execution_results.items():
-            if isinstance(output, str):
-                # Parse the output to extract timestamp and content
-                parts = output.split(' %% (', 1)
-                if len(parts) == 2:
-                    actual_output = parts[1].split('): ', 1)
-                    if len(actual_output) == 2:
-                        _, content = actual_output
-                        agent_trace = AgentTrace(
-                            agent_id=agent_name,
-                            input_data="",  # Would need more detailed tracing
-                            output_data=content,
-                            prompt="",  # Would need access to agent config
-                            tools_used=[]
-                        )
-                        self.current_trace.agent_traces[agent_name] = agent_trace
+        # Only string outputs carry the "name %% (timestamp): content" header;
+        # select them once so the parsing loop needs no per-item type checks
+        string_outputs = [
+            (agent_name, output)
+            for agent_name, output in execution_results.items()
+            if type(output) is str
+        ]
+        
+        # Collect locally and merge into the trace in one bulk update
+        agent_traces = {}
+        for agent_name, output in string_outputs:
+            # Locate the timestamp header in one scan and slice the content once
+            header = _RESPONSE_HEADER_RE.search(output)
+            if header:
+                agent_traces[agent_name] = AgentTrace(
+                    agent_id=agent_name,
+                    input_data="",  # Would need more detailed tracing
+                    output_data=output[header.end():],
+                    prompt="",  # Would need access to agent config
+                    tools_used=[]
+                )
+        
+        trace.agent_traces.update(agent_traces)
     
     def get_agent_prompts(self, agent_config: Dict[str, Any]) -> Dict[str, str]:
         """Extract agent prompts from configuration."""
         prompts = {}
         
-        def extract_recursive(agent_dict: Dict[str, Any]):
+        # Iterative pre-order walk; sub-agents are pushed in reverse so they
+        # are visited in declaration order, matching a recursive traversal
+        stack = [agent_config]
+        while stack:
+            agent_dict = stack.pop()
             if 'name' in agent_dict and 'instruction' in agent_dict:
                 prompts[agent_dict['name']] = agent_dict['instruction']
             
-            if 'sub_agents' in agent_dict:
-                for sub_agent in agent_dict['sub_agents']:
-                    extract_recursive(sub_agent)
+            sub_agents = agent_dict.get('sub_agents')
+            if sub_agents:
+                stack.extend(reversed(sub_agents))
         
-        extract_recursive(agent_config)
         return prompts
-    
@@ -0,0 +1,198 @@
+"""
+Semantic Response Cache - Reuses LLM responses for near-duplicate prompts.
+
+Across optimization iterations the suggester is often called with prompts that
+differ only slightly. An exact-match cache misses these; this cache compares
+prompt embeddings and returns a stored response when the cosine similarity to a
+previous prompt (with the same system message) reaches a threshold.
+
+With persist_path set, entries are reloaded on construction and saved to a
+JSON file in a worker thread after stores, so slowly drifting prompts keep
+hitting the cache across optimization runs without blocking the event loop.
+Await aflush() (or call flush()) before exiting to write the latest entries.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EmbeddingFunction = Callable[[str], Awaitable[List[float]]]
+
+
+class SemanticResponseCache:
+    """In-memory LRU of (system message, prompt embedding) -> LLM response."""
+
+    def __init__(
+        self,
+        embed_fn: Optional[EmbeddingFunction] = None,
+        threshold: float = 0.95,
+        max_entries: int = 128,
+        embedding_model: str = "text-embedding-3-small",
+        persist_path: Optional[str] = None
+    ):
+        """
+        Args:
+            embed_fn: Async function returning an embedding vector for a text.
+                      Defaults to litellm.aembedding with embedding_model.
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached responses (LRU eviction)
+            embedding_model: Model used by the default embedding function
+            persist_path: Optional JSON file used to keep entries across runs
+        """
+        self.embed_fn = embed_fn or self._litellm_embedding
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.embedding_model = embedding_model
+        # Each entry: (system_message, unit-normalized embedding, response)
+        self._entries: "OrderedDict[int, Tuple[str, List[float], str]]" = OrderedDict()
+        self._next_id = 0
+        self.persist_path = persist_path
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        if persist_path:
+            self._load()
+
+    async def _litellm_embedding(self, text: str) -> List[float]:
+        """Embed text with LiteLLM."""
+        import litellm
+
+        response = await litellm.aembedding(model=self.embedding_model, input=[text])
+        return response.data[0]['embedding']
+
+    async def embed(self, prompt: str) -> Optional[List[float]]:
+        """Return the unit-normalized embedding of a prompt, or None if embedding fails."""
+        try:
+            vector = await self.embed_fn(prompt)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed, skipping cache: {str(e)}")
+            return None
+
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm == 0:
+            return None
+        return [value / norm for value in vector]
+
+    def lookup(self, system_message: str, embedding: Optional[List[float]]) -> Optional[str]:
+        """Return the cached response most similar to the embedding, if above threshold."""
+        if embedding is None:
+            return None
+
+        best_id = None
+        best_similarity = self.threshold
+        for entry_id, (entry_system_message, entry_embedding, _) in self._entries.items():
+            if entry_system_message != system_message:
+                continue
+            similarity = sum(a * b for a, b in zip(embedding, entry_embedding))
+            if similarity >= best_similarity:
+                best_id = entry_id
+                best_similarity = similarity
+
+        if best_id is None:
+            return None
+
+        self._entries.move_to_end(best_id)
+        logger.info(f"Semantic cache hit (similarity={best_similarity:.3f})")
+        return self._entries[best_id][2]
+
+    def store(self, system_message: str, embedding: Optional[List[float]], response: str) -> None:
+        """Cache a response under its prompt embedding, evicting the oldest entry if full."""
+        if embedding is None:
+            return
+
+        self._entries[self._next_id] = (system_message, embedding, response)
+        self._next_id += 1
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._mark_dirty()
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+        self._mark_dirty()
+
+    def flush(self) -> None:
+        """Write pending changes to persist_path now, on the calling thread."""
+        if self.persist_path and self._dirty:
+            self._dirty = False
+            self._write(list(self._entries.values()))
+
+    async def aflush(self) -> None:
+        """Wait for any background save, then write remaining changes in a worker thread."""
+        if self._save_task is not None:
+            await self._save_task
+        await self._save_in_background()
+
+    def _mark_dirty(self) -> None:
+        """Record unsaved changes and start a background save if none is running."""
+        if not self.persist_path:
+            return
+        self._dirty = True
+        if self._save_task is not None and not self._save_task.done():
+            return  # The running save loops until nothing is dirty
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._save_task = loop.create_task(self._save_in_background())
+
+    async def _save_in_background(self) -> None:
+        """Write snapshots in a worker thread until no changes are pending."""
+        loop = asyncio.get_running_loop()
+        while self.persist_path and self._dirty:
+            self._dirty = False
+            await loop.run_in_executor(None, self._write, list(self._entries.values()))
+
+    def _load(self) -> None:
+        """Load persisted entries, oldest first; a missing or unreadable file starts empty."""
+        if not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            # ValueError covers truncated or corrupt JSON (JSONDecodeError) and bad encodings
+            logger.warning(f"Could not load semantic cache from {self.persist_path}: {str(e)}")
+            return
+        if not isinstance(entries, list):
+            logger.warning(f"Ignoring semantic cache {self.persist_path}: expected a list of entries")
+            return
+
+        skipped = 0
+        for entry in entries[-self.max_entries:]:
+            if not self._is_valid_entry(entry):
+                skipped += 1
+                continue
+            system_message, embedding, response = entry
+            self._entries[self._next_id] = (system_message, embedding, response)
+            self._next_id += 1
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed semantic cache entries in {self.persist_path}")
+
+    @staticmethod
+    def _is_valid_entry(entry) -> bool:
+        """Whether a persisted entry is a [system_message, embedding, response] triple."""
+        return (
+            isinstance(entry, list)
+            and len(entry) == 3
+            and isinstance(entry[0], str)
+            and isinstance(entry[1], list)
+            and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in entry[1])
+            and isinstance(entry[2], str)
+        )
+
+    def _write(self, entries: List[Tuple[str, List[float], str]]) -> None:
+        """Write entries to persist_path, replacing the file atomically via a temp file."""
+        tmp_path = f"{self.persist_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.persist_path)
+        except OSError as e:
+            logger.warning(f"Could not save semantic cache to {self.persist_path}: {str(e)}")
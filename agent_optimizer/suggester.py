@@ -1,25 +1,261 @@
 """
 Suggestion Generator Agent - Generates prompt modification suggestions based on feedback.
+
+Suggestion and aggregation calls spend nearly all of their time awaiting LLM
+network I/O. Applications that issue many of them per optimization round can
+run on uvloop to cut event-loop overhead (agent_optimizer/example.py does so
+when uvloop is installed; uvicorn picks it up automatically).
 """
 
+import hashlib
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import re
+import statistics
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from operator import attrgetter
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+try:
+    from contextlib import aclosing
+except ImportError:
+    # Python < 3.10
+    @asynccontextmanager
+    async def aclosing(thing):
+        try:
+            yield thing
+        finally:
+            await thing.aclose()
 
 from .types import (
     EvaluationResult, PromptSuggestion, OptimizationObjective, 
     WorkflowTrace, InputOutputPair, LLMServiceError, AgentFeedback
 )
 from .config_loader import get_optimizer_config
+from .semantic_cache import SemanticResponseCache
 
 logger = logging.getLogger(__name__)
 
+_JSON_CLOSERS = {'[': ']', '{': '}'}
+# Only quotes, backslashes and brackets affect the scan; re skips everything else in C
+_JSON_STRUCTURE_RE = re.compile(r'[\\"\[\]{}]')
+
+
+def _extract_json(text: str, opener: str = '[') -> Optional[str]:
+    """
+    Return the first balanced JSON array or object in text, or None if there is none.
+    
+    Walks the structural characters once with a depth counter, skipping brackets inside
+    JSON strings, so trailing prose or a second JSON block does not end up in the
+    extracted slice.
+    """
+    closer = _JSON_CLOSERS[opener]
+    start = text.find(opener)
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped_end = -1
+    for match in _JSON_STRUCTURE_RE.finditer(text, start):
+        i = match.start()
+        if i < escaped_end:
+            # Escaped by the preceding backslash
+            continue
+        char = match.group()
+        if in_string:
+            if char == '\\':
+                escaped_end = i + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == opener:
+            depth += 1
+        elif char == closer:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+class _JSONArrayStream:
+    """Incrementally split a streamed JSON array into its top-level element strings."""
+    
+    def __init__(self):
+        self.started = False
+        self.closed = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._element: List[str] = []
+    
+    def feed(self, chunk: str) -> List[str]:
+        """Consume a chunk of text and return the elements it completed."""
+        elements = []
+        for char in chunk:
+            if self.closed:
+                break
+            if not self.started:
+                if char == '[':
+                    self.started = True
+                    self._depth = 1
+                continue
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '[{':
+                self._depth += 1
+            elif char in ']}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.closed = True
+                    self._flush(elements)
+                    break
+            elif char == ',' and self._depth == 1:
+                self._flush(elements)
+                continue
+            self._element.append(char)
+        return elements
+    
+    def _flush(self, elements: List[str]) -> None:
+        element = "".join(self._element).strip()
+        self._element.clear()
+        if element:
+            elements.append(element)
+
+
+# Prompt excerpts shown to the aggregation and suggestion LLMs. The budget is counted
+# in tokens of the target model (75 tokens is roughly the 300 characters previously
+# shown), so excerpts of dense or non-English prompts are shorter in characters.
+# Without tiktoken the excerpt falls back to a 300-character cut.
+_PROMPT_CONTEXT_MAX_TOKENS = 75
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model_name: str) -> Optional[Any]:
+    """Return the tiktoken encoding for a model, or None if tiktoken cannot provide one."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        try:
+            # LiteLLM model names carry a provider prefix, e.g. "openai/gpt-4o"
+            return tiktoken.encoding_for_model(model_name.rsplit('/', 1)[-1])
+        except KeyError:
+            return tiktoken.get_encoding('cl100k_base')
+    except Exception as e:
+        logger.warning(f"Token-aware truncation unavailable, using characters: {str(e)}")
+        return None
+
+
+@lru_cache(maxsize=512)
+def _truncate_prompt(prompt: str, max_tokens: int, model_name: str) -> str:
+    """Cut a prompt to at most max_tokens tokens; cached so each prompt is tokenized once."""
+    encoding = _get_encoding(model_name)
+    if encoding is None:
+        return prompt[:max_tokens * _CHARS_PER_TOKEN]
+    
+    tokens = encoding.encode(prompt, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return prompt
+    return encoding.decode(tokens[:max_tokens])
+
+
+@lru_cache(maxsize=128)
+def _render_prompt_items(prompt_items: Tuple[Tuple[str, str], ...], max_tokens: int, model_name: str) -> str:
+    return "\n".join(
+        f"Agent '{agent_id}': {_truncate_prompt(prompt, max_tokens, model_name)}..."
+        for agent_id, prompt in prompt_items
+    )
+
+
+def _render_prompts_context(
+    current_prompts: Dict[str, str],
+    model_name: str,
+    max_tokens: int = _PROMPT_CONTEXT_MAX_TOKENS
+) -> str:
+    """
+    Render the truncated current prompts shown to the aggregation and suggestion LLMs.
+    
+    Prompts are cut to max_tokens tokens of the target model, or to
+    max_tokens * _CHARS_PER_TOKEN characters when no tokenizer is available. Both
+    calls share one truncation length and the result is memoized, so unchanged prompts always produce
+    byte-identical context (which keeps provider prefix caches warm).
+    """
+    return _render_prompt_items(tuple(current_prompts.items()), max_tokens, model_name)
+
+
+def _agent_feedback_from_dict(feedback: Dict[str, Any]) -> AgentFeedback:
+    """Build an AgentFeedback from one parsed agent_feedback entry, defaulting missing fields."""
+    get = feedback.get
+    return AgentFeedback(get('agent_id', ''), get('issue', ''), get('evidence', ''), get('suggested_fix'))
+
+
+def _loads_json(json_str: str) -> Any:
+    """Parse JSON with orjson when available; its decode errors subclass json.JSONDecodeError."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(json_str)
+    return json.loads(json_str)
+
 
 class SuggestionGenerator:
     """Generates prompt modification suggestions to improve workflow output."""
     
-    def __init__(self, model_name: str = "openai/gpt-4o"):
+    def __init__(
+        self,
+        model_name: str = "openai/gpt-4o",
+        enable_llm_cache: bool = False,
+        semantic_cache: Optional[SemanticResponseCache] = None,
+        batch_aggregation_suggestions: bool = False,
+        stream_llm_responses: bool = False,
+        no_change_threshold: Optional[float] = None
+    ):
+        """
+        Args:
+            model_name: Model used for suggestion and aggregation calls
+            enable_llm_cache: Reuse LLM responses for exactly repeated
+                              (model, system message, prompt) requests
+            semantic_cache: Optional cache that also reuses suggestion responses
+                            for near-duplicate prompts
+            batch_aggregation_suggestions: Ask the multi-pair aggregation call to
+                                           also return suggestions, skipping the
+                                           separate suggestion call when it does
+            stream_llm_responses: Stream suggestion responses and parse each
+                                  suggestion while the rest is still downloading
+            no_change_threshold: Opt-in cutoff; evaluations (the aggregated one
+                                 for multiple pairs) scoring at or above this,
+                                 with no agent-specific feedback, get no
+                                 suggestions and no LLM call (None, the
+                                 default, always calls the LLM)
+        """
         self.model_name = model_name
+        self.enable_llm_cache = enable_llm_cache
+        self._llm_cache: Dict[str, str] = {}
+        self.semantic_cache = semantic_cache
+        self.batch_aggregation_suggestions = batch_aggregation_suggestions
+        self.stream_llm_responses = stream_llm_responses
+        self.no_change_threshold = no_change_threshold
         self.config = get_optimizer_config()
         self.suggestion_prompts = {
             OptimizationObjective.ACCURACY: self.config.get_suggester_prompt('accuracy'),
@@ -27,6 +263,12 @@ class SuggestionGenerator:
             OptimizationObjective.FACTUALITY: self.config.get_suggester_prompt('factuality'),
             OptimizationObjective.INSTRUCTION_FOLLOWING: self.config.get_suggester_prompt('instruction_following')
         }
+        self.aggregation_prompt = self.config.get_suggester_prompt('feedback_aggregation')
+        self.batched_aggregation_prompt = (
+            self.aggregation_prompt + self.config.get_suggester_prompt('feedback_aggregation_suggestions')
+        )
+        self.default_system_message = self.config.get_suggester_system_message('default')
+        self.aggregation_system_message = self.config.get_suggester_system_message('aggregation')
     
     async def generate_suggestions(
         self,
@@ -90,6 +332,15 @@ class SuggestionGenerator:
             List of PromptSuggestion objects
         """
         try:
+            # An aggregated result that already meets the no-change threshold needs no further work;
+            # every pair stays in the aggregation otherwise, so regressions on good cases remain visible
+            if self._needs_no_change(aggregated_evaluation):
+                logger.info(
+                    f"Aggregated score {aggregated_evaluation.score:.3f} meets the no-change threshold, "
+                    "skipping suggestion generation"
+                )
+                return []
+            
             # When we have multiple pairs, we need to aggregate feedback across all pairs
             if len(individual_evaluations) == 1:
                 # Single pair - use existing method
@@ -106,20 +357,25 @@ class SuggestionGenerator:
             logger.info(f"Generating suggestions for {len(individual_evaluations)} input-output pairs")
             
             # Step 1: Aggregate feedback across all pairs using LLM
-            aggregated_feedback = await self._aggregate_feedback_across_pairs(
+            aggregated_feedback, suggestions = await self._aggregate_feedback_across_pairs(
                 individual_evaluations,
                 input_output_pairs,
                 current_prompts,
-                objective
+                objective,
+                include_suggestions=self.batch_aggregation_suggestions
             )
             
-            # Step 2: Generate suggestions based on aggregated feedback using LLM-only approach
-            suggestions = await self._generate_global_suggestions(
-                current_prompts=current_prompts,
-                evaluation_result=aggregated_feedback,
-                objective=objective,
-                expected_output="Multiple input-output pairs analyzed"
-            )
+            # Step 2: Generate suggestions based on aggregated feedback using LLM-only approach,
+            # unless suggestions were requested from the aggregation call and it returned them
+            if self.batch_aggregation_suggestions and suggestions:
+                logger.info(f"Using {len(suggestions)} suggestions returned by the aggregation call")
+            else:
+                suggestions = await self._generate_global_suggestions(
+                    current_prompts=current_prompts,
+                    evaluation_result=aggregated_feedback,
+                    objective=objective,
+                    expected_output="Multiple input-output pairs analyzed"
+                )
             
             # Deduplicate and rank suggestions
             final_suggestions = self._deduplicate_and_rank_suggestions(suggestions)
@@ -136,11 +392,28 @@ class SuggestionGenerator:
         individual_evaluations: List[EvaluationResult],
         input_output_pairs: List[InputOutputPair],
         current_prompts: Dict[str, str],
-        objective: OptimizationObjective
-    ) -> EvaluationResult:
+        objective: OptimizationObjective,
+        include_suggestions: bool = False
+    ) -> Tuple[EvaluationResult, List[PromptSuggestion]]:
         """
         Aggregate feedback from multiple pairs using an LLM to synthesize insights.
+        
+        Args:
+            individual_evaluations: Evaluation results for each pair
+            input_output_pairs: The input-output pairs used
+            current_prompts: Current prompts for each agent
+            objective: Optimization objective
+            include_suggestions: Also ask the LLM for prompt suggestions in the same call
+            
+        Returns:
+            Tuple of (aggregated EvaluationResult, suggestions returned by the LLM).
+            The suggestion list is empty unless include_suggestions is set and the
+            response contained valid suggestions.
         """
+        # Average once up front; both the LLM path and the fallback reuse it
+        scores = [eval_result.score for eval_result in individual_evaluations]
+        avg_score = statistics.fmean(scores) if scores else 0.0
+        
         try:
             # Import LLM utility functions
             from .llm_utils import call_evaluation_agent
@@ -150,82 +423,91 @@ class SuggestionGenerator:
             all_agent_feedback = []
             
             for i, (eval_result, pair) in enumerate(zip(individual_evaluations, input_output_pairs)):
-                pair_summary = f"Pair {i+1}:\n"
-                pair_summary += f"  Score: {eval_result.score:.3f}\n"
-                pair_summary += f"  Global Feedback: {eval_result.global_feedback}\n"
+                # Collect the summary lines and join once instead of growing a string
+                summary_lines = [
+                    f"Pair {i+1}:\n",
+                    f"  Score: {eval_result.score:.3f}\n",
+                    f"  Global Feedback: {eval_result.global_feedback}\n"
+                ]
                 
                 if eval_result.agent_feedback:
-                    pair_summary += f"  Agent Feedback:\n"
+                    summary_lines.append("  Agent Feedback:\n")
                     for feedback in eval_result.agent_feedback:
-                        pair_summary += f"    - {feedback.agent_id}: {feedback.issue}\n"
-                        pair_summary += f"      Evidence: {feedback.evidence}\n"
+                        summary_lines.append(f"    - {feedback.agent_id}: {feedback.issue}\n")
+                        summary_lines.append(f"      Evidence: {feedback.evidence}\n")
                         
                         # Collect for overall aggregation
                         all_agent_feedback.append(feedback)
                 
-                pair_summaries.append(pair_summary)
+                pair_summaries.append("".join(summary_lines))
             
             # Create aggregation prompt
-            aggregation_prompt = self.config.get_suggester_prompt('feedback_aggregation').format(
-                num_pairs=len(individual_evaluations),
-                pair_summaries="\n\n".join(pair_summaries),
-                current_prompts="\n".join([
-                    f"Agent '{agent_id}': {prompt[:200]}..."
-                    for agent_id, prompt in current_prompts.items()
-                ]),
-                objective=objective.value
-            )
+            template = self.batched_aggregation_prompt if include_suggestions else self.aggregation_prompt
+            aggregation_prompt = template.format_map({
+                'num_pairs': len(individual_evaluations),
+                'pair_summaries': "\n\n".join(pair_summaries),
+                'current_prompts': _render_prompts_context(current_prompts, self.model_name),
+                'objective': objective.value
+            })
             
             # Use LLM to aggregate feedback
-            system_message = self.config.get_suggester_system_message('aggregation')
-            aggregated_response = await call_evaluation_agent(
-                evaluation_prompt=aggregation_prompt,
-                system_instruction=system_message,
-                model_name=self.model_name
-            )
+            system_message = self.aggregation_system_message
+            cache_key = self._llm_cache_key(system_message, aggregation_prompt)
+            aggregated_response = self._get_cached_llm_response(cache_key)
+            if aggregated_response is None:
+                aggregated_response = await call_evaluation_agent(
+                    evaluation_prompt=aggregation_prompt,
+                    system_instruction=system_message,
+                    model_name=self.model_name
+                )
             
             # Parse the aggregated response
             aggregated_feedback = self._parse_aggregated_feedback(aggregated_response)
+            self._store_llm_response(cache_key, aggregated_response)
             
-            # Calculate average score
-            avg_score = sum(eval_result.score for eval_result in individual_evaluations) / len(individual_evaluations)
+            # Suggestions are only trusted when this call asked for them
+            suggestions = [
+                PromptSuggestion(
+                    agent_id=suggestion_data['agent_id'],
+                    new_prompt=suggestion_data['new_prompt'],
+                    reason=suggestion_data['reason'],
+                    confidence=suggestion_data['confidence']
+                )
+                for suggestion_data in aggregated_feedback.get('suggestions', [])
+            ] if include_suggestions else []
             
             return EvaluationResult(
                 score=avg_score,
                 global_feedback=aggregated_feedback.get('global_feedback', 'Aggregated feedback from multiple pairs'),
                 agent_feedback=aggregated_feedback.get('agent_feedback', []),
                 metrics={}
-            )
+            ), suggestions
             
         except Exception as e:
             logger.error(f"Error aggregating feedback: {str(e)}")
             # Fallback: simple concatenation
-            combined_feedback = f"Combined feedback from {len(individual_evaluations)} pairs:\n"
+            feedback_parts = [f"Combined feedback from {len(individual_evaluations)} pairs:\n"]
             combined_agent_feedback = []
             
             for i, eval_result in enumerate(individual_evaluations):
-                combined_feedback += f"\nPair {i+1}: {eval_result.global_feedback}\n"
+                feedback_parts.append(f"\nPair {i+1}: {eval_result.global_feedback}\n")
                 combined_agent_feedback.extend(eval_result.agent_feedback)
             
-            avg_score = sum(eval_result.score for eval_result in individual_evaluations) / len(individual_evaluations)
-            
             return EvaluationResult(
                 score=avg_score,
-                global_feedback=combined_feedback,
+                global_feedback="".join(feedback_parts),
                 agent_feedback=combined_agent_feedback,
                 metrics={}
-            )
+            ), []
     
     def _parse_aggregated_feedback(self, response: str) -> Dict[str, Any]:
         """Parse the LLM response for aggregated feedback."""
         try:
             # Try to extract JSON from response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
+            json_str = _extract_json(response, '{')
             
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = response[start_idx:end_idx]
-                parsed_response = json.loads(json_str)
+            if json_str is not None:
+                parsed_response = _loads_json(json_str)
                 
                 # Validate required fields
                 if 'global_feedback' not in parsed_response:
@@ -237,19 +519,22 @@ class SuggestionGenerator:
                 
                 # Convert agent_feedback dictionaries to AgentFeedback objects
                 if 'agent_feedback' in parsed_response and isinstance(parsed_response['agent_feedback'], list):
-                    agent_feedback_objects = []
-                    for feedback_dict in parsed_response['agent_feedback']:
-                        if isinstance(feedback_dict, dict):
-                            agent_feedback_objects.append(AgentFeedback(
-                                agent_id=feedback_dict.get('agent_id', ''),
-                                issue=feedback_dict.get('issue', ''),
-                                evidence=feedback_dict.get('evidence', ''),
-                                suggested_fix=feedback_dict.get('suggested_fix')
-                            ))
-                        else:
-                            # If it's already an AgentFeedback object, keep it
-                            agent_feedback_objects.append(feedback_dict)
-                    parsed_response['agent_feedback'] = agent_feedback_objects
+                    parsed_response['agent_feedback'] = [
+                        _agent_feedback_from_dict(feedback) if isinstance(feedback, dict) else feedback
+                        for feedback in parsed_response['agent_feedback']
+                        # Already-built AgentFeedback objects pass through; other JSON values are dropped
+                        if isinstance(feedback, (dict, AgentFeedback))
+                    ]
+                
+                # Suggestions are optional; a malformed list falls back to a separate suggestion call
+                if 'suggestions' in parsed_response:
+                    try:
+                        parsed_response['suggestions'] = self._validate_suggestions(
+                            parsed_response['suggestions'], response
+                        )
+                    except LLMServiceError as e:
+                        logger.warning(f"Ignoring suggestions in aggregated response: {e.message}")
+                        parsed_response['suggestions'] = []
                 
                 return parsed_response
             else:
@@ -285,27 +570,12 @@ class SuggestionGenerator:
         """Generate suggestions based on global feedback."""
         suggestions = []
         
-        # Use LLM to generate suggestions
-        suggestion_prompt = self.suggestion_prompts[objective]
-        
-        # Prepare context
-        prompts_context = "\n".join([
-            f"Agent '{agent_id}': {prompt[:300]}..."
-            for agent_id, prompt in current_prompts.items()
-        ])
-        
-        # Prepare agent-specific feedback
-        agent_feedback_context = ""
-        if evaluation_result.agent_feedback:
-            agent_feedback_context = "\n\nAgent-Specific Feedback:\n"
-            for feedback in evaluation_result.agent_feedback:
-                agent_feedback_context += f"- {feedback.agent_id}: {feedback.issue}\n  Evidence: {feedback.evidence}\n"
+        if self._needs_no_change(evaluation_result):
+            logger.info(f"Score {evaluation_result.score:.3f} meets the no-change threshold, skipping LLM call")
+            return suggestions
         
-        full_prompt = suggestion_prompt.format(
-            current_prompts=prompts_context,
-            global_feedback=evaluation_result.global_feedback + agent_feedback_context,
-            score=evaluation_result.score,
-            expected_output=expected_output or "Not provided"
+        full_prompt = self._build_global_suggestion_prompt(
+            current_prompts, evaluation_result, objective, expected_output
         )
         
         try:
@@ -326,6 +596,112 @@ class SuggestionGenerator:
             logger.error(f"Error in global suggestion generation: {str(e)}")
         
         return suggestions
+    
+    def _needs_no_change(self, evaluation_result: EvaluationResult) -> bool:
+        """Whether an evaluation is good enough that no suggestions should be generated."""
+        return (
+            self.no_change_threshold is not None
+            and evaluation_result.score >= self.no_change_threshold
+            and not evaluation_result.agent_feedback
+        )
+    
+    def _build_global_suggestion_prompt(
+        self,
+        current_prompts: Dict[str, str],
+        evaluation_result: EvaluationResult,
+        objective: OptimizationObjective,
+        expected_output: Optional[str] = None
+    ) -> str:
+        """Render the objective's suggestion prompt for the given feedback."""
+        suggestion_prompt = self.suggestion_prompts[objective]
+        
+        # Prepare context
+        prompts_context = _render_prompts_context(current_prompts, self.model_name)
+        
+        # Prepare agent-specific feedback
+        agent_feedback_context = ""
+        if evaluation_result.agent_feedback:
+            feedback_parts = ["\n\nAgent-Specific Feedback:\n"]
+            feedback_parts.extend(
+                f"- {feedback.agent_id}: {feedback.issue}\n  Evidence: {feedback.evidence}\n"
+                for feedback in evaluation_result.agent_feedback
+            )
+            agent_feedback_context = "".join(feedback_parts)
+        
+        return suggestion_prompt.format_map({
+            'current_prompts': prompts_context,
+            'global_feedback': evaluation_result.global_feedback + agent_feedback_context,
+            'score': evaluation_result.score,
+            'expected_output': expected_output or "Not provided"
+        })
+    
+    async def stream_suggestions(
+        self,
+        current_prompts: Dict[str, str],
+        evaluation_result: EvaluationResult,
+        objective: OptimizationObjective = OptimizationObjective.ACCURACY,
+        expected_output: Optional[str] = None
+    ) -> AsyncIterator[PromptSuggestion]:
+        """
+        Stream suggestions as the LLM generates them.
+        
+        Each suggestion is yielded as soon as its JSON object is complete, so callers
+        can start applying the first one while later ones are still being generated.
+        Suggestions come in generation order and are not deduplicated or ranked;
+        malformed elements are skipped. Bypasses the LLM response caches.
+        
+        Args:
+            current_prompts: Current prompts for each agent
+            evaluation_result: Result from output evaluation
+            objective: Optimization objective
+            expected_output: Expected output for context
+            
+        Yields:
+            PromptSuggestion objects
+            
+        Raises:
+            LLMServiceError: With error_type "service_error" if the LLM call fails
+        """
+        from .llm_utils import call_suggestion_agent_stream
+        
+        full_prompt = self._build_global_suggestion_prompt(
+            current_prompts, evaluation_result, objective, expected_output
+        )
+        system_message = self.default_system_message
+        
+        parser = _JSONArrayStream()
+        chunks = call_suggestion_agent_stream(
+            suggestion_prompt=full_prompt,
+            system_instruction=system_message,
+            model_name=self.model_name
+        )
+        try:
+            # aclosing stops the underlying model request when we break out early
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    for element in parser.feed(chunk):
+                        try:
+                            suggestion_data = self._validate_suggestions([_loads_json(element)], element)[0]
+                        except (json.JSONDecodeError, LLMServiceError) as e:
+                            logger.warning(f"Skipping malformed streamed suggestion: {str(e)}")
+                            continue
+                        yield PromptSuggestion(
+                            agent_id=suggestion_data['agent_id'],
+                            new_prompt=suggestion_data['new_prompt'],
+                            reason=suggestion_data['reason'],
+                            confidence=suggestion_data['confidence']
+                        )
+                    if parser.closed:
+                        # Stop reading once the array is complete; trailing prose is not needed
+                        break
+        except Exception as e:
+            # Let consumers tell a failed call apart from a model that returned nothing
+            logger.error(f"Suggestion stream failed: {str(e)}")
+            raise LLMServiceError(
+                message=f"Suggestion agent service error: {str(e)}",
+                error_type="service_error",
+                original_response=None
+            )
         
     def _deduplicate_and_rank_suggestions(
         self,
@@ -333,19 +709,17 @@ class SuggestionGenerator:
     ) -> List[PromptSuggestion]:
         """Remove duplicates and rank suggestions by confidence."""
         # Group by agent_id and keep highest confidence
-        agent_suggestions = {}
+        agent_suggestions: Dict[str, PromptSuggestion] = {}
         
         for suggestion in suggestions:
-            agent_id = suggestion.agent_id
-            if agent_id not in agent_suggestions:
-                agent_suggestions[agent_id] = suggestion
-            elif suggestion.confidence > agent_suggestions[agent_id].confidence:
-                agent_suggestions[agent_id] = suggestion
+            current = agent_suggestions.get(suggestion.agent_id)
+            if current is None or suggestion.confidence > current.confidence:
+                agent_suggestions[suggestion.agent_id] = suggestion
         
         # Sort by confidence
         ranked_suggestions = sorted(
             agent_suggestions.values(),
-            key=lambda x: x.confidence,
+            key=attrgetter('confidence'),
             reverse=True
         )
         
@@ -365,23 +739,47 @@ class SuggestionGenerator:
             from .llm_utils import call_suggestion_agent
             
             # Prepare the system message
-            system_message = self.config.get_suggester_system_message('default')
+            system_message = self.default_system_message
             
             logger.info(f"Calling suggestion agent with prompt length: {len(full_prompt)}")
-            logger.info(f"Suggestion Agent Input Prompt:\n{full_prompt}")
+            logger.info("Suggestion Agent Input Prompt:\n%s", full_prompt)
             
             # Use Google ADK agent instead of direct LiteLLM call
-            response_text = await call_suggestion_agent(
-                suggestion_prompt=full_prompt,
-                system_instruction=system_message,
-                model_name=self.model_name  # Now properly uses the model_name parameter!
-            )
+            cache_key = self._llm_cache_key(system_message, full_prompt)
+            response_text = self._get_cached_llm_response(cache_key)
+            
+            # Fall back to a near-duplicate prompt's response before calling the LLM
+            prompt_embedding = None
+            if response_text is None and self.semantic_cache is not None:
+                prompt_embedding = await self.semantic_cache.embed(full_prompt)
+                response_text = self.semantic_cache.lookup(system_message, prompt_embedding)
+                if response_text is not None:
+                    prompt_embedding = None  # Already cached, nothing to store
+            
+            suggestions = None
+            if response_text is None and self.stream_llm_responses:
+                from .llm_utils import call_suggestion_agent_stream
+                
+                response_text, suggestions = await self._parse_llm_response_stream(
+                    call_suggestion_agent_stream(
+                        suggestion_prompt=full_prompt,
+                        system_instruction=system_message,
+                        model_name=self.model_name
+                    )
+                )
+            elif response_text is None:
+                response_text = await call_suggestion_agent(
+                    suggestion_prompt=full_prompt,
+                    system_instruction=system_message,
+                    model_name=self.model_name  # Now properly uses the model_name parameter!
+                )
             
             logger.info(f"Suggestion agent response length: {len(response_text)}")
-            logger.info(f"Suggestion Agent Raw Response: {response_text}")
+            logger.info("Suggestion Agent Raw Response: %s", response_text)
             
-            # Try to extract JSON from the response
-            suggestions = self._parse_llm_response(response_text)
+            # Try to extract JSON from the response, unless streaming already parsed it
+            if suggestions is None:
+                suggestions = self._parse_llm_response(response_text)
             
             if not suggestions:
                 raise LLMServiceError(
@@ -390,6 +788,9 @@ class SuggestionGenerator:
                     original_response=response_text
                 )
             
+            self._store_llm_response(cache_key, response_text)
+            if prompt_embedding is not None:
+                self.semantic_cache.store(system_message, prompt_embedding, response_text)
             return suggestions
             
         except LLMServiceError:
@@ -403,46 +804,83 @@ class SuggestionGenerator:
                 original_response=None
             )
     
+    async def _parse_llm_response_stream(
+        self,
+        chunks: AsyncIterator[str]
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        """
+        Consume a streamed LLM response, decoding and validating each suggestion
+        as soon as its array element closes.
+        
+        Args:
+            chunks: Text chunks of the LLM response; closed when this returns
+            
+        Returns:
+            Tuple of (full response text, validated suggestions). Suggestions are
+            None when no complete JSON array was seen, so the caller can fall back
+            to parsing the full text.
+        """
+        parser = _JSONArrayStream()
+        parts: List[str] = []
+        suggestions: List[Dict[str, Any]] = []
+        
+        # aclosing stops the underlying model request when we break out early
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                parts.append(chunk)
+                for element in parser.feed(chunk):
+                    try:
+                        suggestion_data = _loads_json(element)
+                    except json.JSONDecodeError as e:
+                        raise LLMServiceError(
+                            message=f"JSON parsing error: {str(e)}",
+                            error_type="parsing_error",
+                            original_response=''.join(parts)
+                        )
+                    suggestions.extend(self._validate_suggestions([suggestion_data], element))
+                if parser.closed:
+                    break
+        
+        response_text = ''.join(parts)
+        if not parser.closed:
+            return response_text, None
+        return response_text, suggestions
+    
+    def _llm_cache_key(self, system_message: str, prompt: str) -> str:
+        """Hash the model, system message and prompt into an LLM cache key."""
+        payload = f"{self.model_name}|{system_message}|{prompt}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _get_cached_llm_response(self, cache_key: str) -> Optional[str]:
+        """Return a cached LLM response, or None on a miss or when caching is disabled."""
+        if not self.enable_llm_cache:
+            return None
+        response_text = self._llm_cache.get(cache_key)
+        if response_text is not None:
+            logger.info("Reusing cached LLM response")
+        return response_text
+    
+    def _store_llm_response(self, cache_key: str, response_text: str) -> None:
+        """Cache an LLM response; only called once the response has parsed successfully."""
+        if self.enable_llm_cache:
+            self._llm_cache[cache_key] = response_text
+    
+    def clear_llm_cache(self) -> None:
+        """Drop all cached LLM responses."""
+        self._llm_cache.clear()
+    
     def _parse_llm_response(self, response_text: str) -> List[Dict[str, Any]]:
         """Parse LLM response and extract suggestion JSON."""
         try:
             # Try to find JSON in the response
-            start_idx = response_text.find('[')
-            end_idx = response_text.rfind(']') + 1
-            
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = response_text[start_idx:end_idx]
-                logger.info(f"Extracted suggestions JSON string: {json_str}")
-                suggestions = json.loads(json_str)
-                logger.info(f"Parsed suggestions JSON object: {suggestions}")
+            json_str = _extract_json(response_text, '[')
+            
+            if json_str is not None:
+                logger.info("Extracted suggestions JSON string: %s", json_str)
+                suggestions = _loads_json(json_str)
+                logger.info("Parsed suggestions JSON object: %s", suggestions)
                 
-                # Validate the structure
-                if isinstance(suggestions, list):
-                    valid_suggestions = []
-                    for i, suggestion in enumerate(suggestions):
-                        if (isinstance(suggestion, dict) and 
-                            'agent_id' in suggestion and 
-                            'new_prompt' in suggestion and 
-                            'reason' in suggestion):
-                            if 'confidence' not in suggestion:
-                                suggestion['confidence'] = 0.7
-                            valid_suggestions.append(suggestion)
-                            logger.info(f"Valid suggestion {i+1}: agent_id={suggestion['agent_id']}, reason={suggestion['reason'][:50]}...")
-                        else:
-                            raise LLMServiceError(
-                                message=f"Invalid suggestion {i+1}: missing required fields (agent_id, new_prompt, reason). Got: {suggestion}",
-                                error_type="format_error",
-                                original_response=response_text
-                            )
-                    
-                    logger.info(f"Successfully parsed {len(valid_suggestions)} valid suggestions from LLM")
-                    return valid_suggestions
-                else:
-                    raise LLMServiceError(
-                        message=f"Expected list of suggestions, got: {type(suggestions)}",
-                        error_type="format_error",
-                        original_response=response_text
-                    )
+                return self._validate_suggestions(suggestions, response_text)
             else:
                 raise LLMServiceError(
                     message="Could not find JSON array structure in LLM response",
@@ -466,3 +904,31 @@ class SuggestionGenerator:
                 original_response=response_text
             )
     
+    def _validate_suggestions(self, suggestions: Any, response_text: str) -> List[Dict[str, Any]]:
+        """Check that parsed suggestions are a list of dicts with the required fields."""
+        if not isinstance(suggestions, list):
+            raise LLMServiceError(
+                message=f"Expected list of suggestions, got: {type(suggestions)}",
+                error_type="format_error",
+                original_response=response_text
+            )
+        
+        valid_suggestions = []
+        for i, suggestion in enumerate(suggestions):
+            if (isinstance(suggestion, dict) and 
+                'agent_id' in suggestion and 
+                'new_prompt' in suggestion and 
+                'reason' in suggestion):
+                if 'confidence' not in suggestion:
+                    suggestion['confidence'] = 0.7
+                valid_suggestions.append(suggestion)
+                logger.info(f"Valid suggestion {i+1}: agent_id={suggestion['agent_id']}, reason={suggestion['reason'][:50]}...")
+            else:
+                raise LLMServiceError(
+                    message=f"Invalid suggestion {i+1}: missing required fields (agent_id, new_prompt, reason). Got: {suggestion}",
+                    error_type="format_error",
+                    original_response=response_text
+                )
+        
+        logger.info(f"Successfully parsed {len(valid_suggestions)} valid suggestions from LLM")
+        return valid_suggestions
@@ -5,25 +5,123 @@ Trace Extractor - Extracts sub-agent inputs/outputs/prompts from workflow runs.
 import json
 import logging
 import re
-from typing import Dict, Any, Optional, List
+import threading
+from types import MappingProxyType
+from typing import ClassVar, Dict, Any, Iterator, Mapping, Optional, List, Pattern, Tuple
 from dataclasses import asdict
 
 from .types import WorkflowTrace, AgentTrace
 
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# (prefix, captured value) pairs; error patterns are listed in priority order
+_ERROR_PATTERNS = (
+    (r'Error: ', r'.+'),
+    (r'Exception: ', r'.+'),
+    (r'Failed: ', r'.+'),
+    (r'Error code: ', r'\d+'),
+)
+
+_TOOL_PATTERNS = (
+    (r'Using tool: ', r'.+'),
+    (r'Tool called: ', r'.+'),
+    (r'Function: ', r'.+'),
+    (r'API call: ', r'.+'),
+)
+
+# All error and tool patterns fused into one regex so each response is scanned once.
+# Every alternative is a lookahead, so overlapping matches of different patterns are
+# all reported, the same as searching for each pattern separately.
+_MARKER_GROUPS = {
+    **{f'error{i}': ('error', i) for i in range(len(_ERROR_PATTERNS))},
+    **{f'tool{i}': ('tool', i) for i in range(len(_TOOL_PATTERNS))},
+}
+_MARKER_PATTERN = re.compile('|'.join(
+    [f'(?={prefix}(?P<error{i}>{value}))' for i, (prefix, value) in enumerate(_ERROR_PATTERNS)] +
+    [f'(?={prefix}(?P<tool{i}>{value}))' for i, (prefix, value) in enumerate(_TOOL_PATTERNS)]
+), re.IGNORECASE)
+
+_ERROR_FLAG_PATTERN = re.compile(r'error|failed', re.IGNORECASE)
+
+# Hyperscan reports match offsets but no groups, so it only locates the marker prefixes
+# and the captured value is read from the bytes that follow
+_MARKER_PREFIXES = (
+    [(f'error{i}', prefix, value) for i, (prefix, value) in enumerate(_ERROR_PATTERNS)] +
+    [(f'tool{i}', prefix, value) for i, (prefix, value) in enumerate(_TOOL_PATTERNS)]
+)
+_DIGITS_BYTES = re.compile(rb'\d+')
+
+
+class _HyperscanMarkerScanner:
+    """Locates all marker prefixes in one DFA pass using a compiled Hyperscan database."""
+    
+    def __init__(self):
+        self.database = hyperscan.Database()
+        self.database.compile(
+            expressions=[prefix.encode('utf-8') for _, prefix, _ in _MARKER_PREFIXES],
+            ids=list(range(len(_MARKER_PREFIXES))),
+            elements=len(_MARKER_PREFIXES),
+            flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+        )
+        # Scratch space may only be used by one scan at a time
+        self._local = threading.local()
+    
+    def scan(self, response: str) -> Iterator[Tuple[str, int, int, str]]:
+        """Yield (group, start, value end, value) for each marker, ordered by start offset."""
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self.database)
+        
+        data = response.encode('utf-8')
+        hits = []
+        self.database.scan(
+            data,
+            match_event_handler=lambda pattern_id, start, end, flags, context: hits.append((start, end, pattern_id)),
+            scratch=scratch
+        )
+        hits.sort()
+        
+        for start, end, pattern_id in hits:
+            group, _, value_pattern = _MARKER_PREFIXES[pattern_id]
+            if value_pattern == r'\d+':
+                digits = _DIGITS_BYTES.match(data, end)
+                value_end = digits.end() if digits else end
+            else:
+                newline = data.find(b'\n', end)
+                value_end = len(data) if newline < 0 else newline
+            if value_end > end:
+                yield group, start, value_end, data[end:value_end].decode('utf-8')
+
 
 class TraceExtractor:
     """Extracts detailed execution traces from workflow runs."""
     
-    def __init__(self):
-        self.trace_patterns = {
-            'agent_start': r'Agent: (.+?) \((.+?)\) started',
-            'agent_finish': r'Agent: (.+?) \((.+?)\) finished',
-            'agent_error': r'Agent: (.+?) \((.+?)\) failed',
-            'final_response': r'Final response received: (\d+) characters',
-            'timestamp': r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})',
-        }
+    trace_patterns: ClassVar[Mapping[str, Pattern]] = MappingProxyType({
+        'agent_start': re.compile(r'Agent: (.+?) \((.+?)\) started'),
+        'agent_finish': re.compile(r'Agent: (.+?) \((.+?)\) finished'),
+        'agent_error': re.compile(r'Agent: (.+?) \((.+?)\) failed'),
+        'final_response': re.compile(r'Final response received: (\d+) characters'),
+        'timestamp': re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})'),
+    })
+    
+    def __init__(self, use_hyperscan: bool = True):
+        """
+        Args:
+            use_hyperscan: Scan responses with Hyperscan when it is installed;
+                           otherwise the fused Python regex is used
+        """
+        self._hyperscan_scanner = None
+        if use_hyperscan and HYPERSCAN_AVAILABLE:
+            try:
+                self._hyperscan_scanner = _HyperscanMarkerScanner()
+            except Exception as e:
+                logger.warning(f"Hyperscan unavailable, falling back to re: {str(e)}")
     
     def extract_trace_from_results(
         self,
@@ -84,21 +182,20 @@ class TraceExtractor:
         
         # Extract timestamp and content from response format
         # Format: "AgentName %% (2023-01-01T12:00:00): actual content"
-        if ' %% (' in response:
-            parts = response.split(' %% (', 1)
-            if len(parts) == 2:
-                remaining = parts[1]
-                if '): ' in remaining:
-                    timestamp_part, content = remaining.split('): ', 1)
-                    output_data = content
-                    # Could parse timestamp here if needed
-        
-        # Check for error patterns
-        if 'error' in response.lower() or 'failed' in response.lower():
-            error = self._extract_error_message(response)
-        
-        # Extract tools used (if any)
-        tools_used = self._extract_tools_used(response)
+        _, header_sep, remaining = response.partition(' %% (')
+        if header_sep:
+            timestamp_part, content_sep, content = remaining.partition('): ')
+            if content_sep:
+                output_data = content
+                # Could parse timestamp here if needed
+        
+        # Scan once for error and tool markers
+        error_message, tools_used = self._scan_response_markers(response)
+        
+        # Only report the error when the response mentions one; matching case-insensitively
+        # avoids lowercasing a copy of the whole response
+        if error_message is not None and _ERROR_FLAG_PATTERN.search(response):
+            error = error_message
         
         return AgentTrace(
             agent_id=agent_id,
@@ -114,16 +211,20 @@ class TraceExtractor:
         """Extract all agent prompts from configuration."""
         prompts = {}
         
-        def extract_recursive(agent_dict: Dict[str, Any]):
-            if isinstance(agent_dict, dict):
-                if 'name' in agent_dict and 'instruction' in agent_dict:
-                    prompts[agent_dict['name']] = agent_dict['instruction']
-                
-                if 'sub_agents' in agent_dict:
-                    for sub_agent in agent_dict['sub_agents']:
-                        extract_recursive(sub_agent)
+        # Iterative pre-order walk; sub-agents are pushed in reverse so they
+        # are visited in declaration order, matching a recursive traversal
+        stack = [agent_config]
+        while stack:
+            agent_dict = stack.pop()
+            if not isinstance(agent_dict, dict):
+                continue
+            if 'name' in agent_dict and 'instruction' in agent_dict:
+                prompts[agent_dict['name']] = agent_dict['instruction']
+            
+            sub_agents = agent_dict.get('sub_agents')
+            if sub_agents:
+                stack.extend(reversed(sub_agents))
         
-        extract_recursive(agent_config)
         return prompts
     
     def _extract_execution_time(self, results: Dict[str, Any]) -> Optional[float]:
@@ -150,39 +251,47 @@ class TraceExtractor:
         
         return str(execution_results)
     
+    def _scan_response_markers(self, response: str) -> Tuple[Optional[str], List[str]]:
+        """
+        Find the error message and tools used in a response with a single regex pass.
+        
+        Returns:
+            Tuple of (first match of the highest-priority error pattern, tools used).
+            Tools are grouped by pattern, and repeated matches of one pattern do not
+            overlap, matching per-pattern re.findall.
+        """
+        first_errors: List[Optional[str]] = [None] * len(_ERROR_PATTERNS)
+        tools_by_pattern: List[List[str]] = [[] for _ in _TOOL_PATTERNS]
+        tool_ends = [0] * len(_TOOL_PATTERNS)
+        
+        if self._hyperscan_scanner is not None:
+            markers = self._hyperscan_scanner.scan(response)
+        else:
+            markers = (
+                (match.lastgroup, match.start(), match.end(match.lastgroup), match.group(match.lastgroup))
+                for match in _MARKER_PATTERN.finditer(response)
+            )
+        
+        for group, start, end, value in markers:
+            kind, index = _MARKER_GROUPS[group]
+            if kind == 'error':
+                if first_errors[index] is None:
+                    first_errors[index] = value
+            elif start >= tool_ends[index]:
+                tools_by_pattern[index].append(value)
+                tool_ends[index] = end
+        
+        error = next((message for message in first_errors if message is not None), None)
+        tools = [tool for pattern_tools in tools_by_pattern for tool in pattern_tools]
+        return error, tools
+    
     def _extract_error_message(self, response: str) -> Optional[str]:
         """Extract error message from response."""
-        error_patterns = [
-            r'Error: (.+)',
-            r'Exception: (.+)',
-            r'Failed: (.+)',
-            r'Error code: (\d+)'
-        ]
-        
-        for pattern in error_patterns:
-            match = re.search(pattern, response, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        
-        return None
+        return self._scan_response_markers(response)[0]
     
     def _extract_tools_used(self, response: str) -> List[str]:
         """Extract tools used from response."""
-        tools = []
-        
-        # Look for common tool patterns
-        tool_patterns = [
-            r'Using tool: (.+)',
-            r'Tool called: (.+)',
-            r'Function: (.+)',
-            r'API call: (.+)'
-        ]
-        
-        for pattern in tool_patterns:
-            matches = re.findall(pattern, response, re.IGNORECASE)
-            tools.extend(matches)
-        
-        return tools
+        return self._scan_response_markers(response)[1]
     
     def _enrich_trace_with_metadata(self, trace: WorkflowTrace, results: Dict[str, Any]) -> None:
         """Enrich trace with additional metadata."""
@@ -2,10 +2,14 @@
 Data structures and type definitions for the agent workflow optimization system.
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Tuple
 from enum import Enum
-import json
+import sys
+
+# Slotted dataclasses (Python 3.10+) for the records created per optimization
+# round; older interpreters fall back to regular dataclasses
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 
 class LLMServiceError(Exception):
@@ -35,7 +39,7 @@ class AggregationStrategy(Enum):
     MEDIAN = "median"  # Median score
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AgentTrace:
     """Trace information for a single agent execution."""
     agent_id: str
@@ -47,7 +51,7 @@ class AgentTrace:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WorkflowTrace:
     """Complete trace of workflow execution."""
     agent_traces: Dict[str, AgentTrace] = field(default_factory=dict)
@@ -55,7 +59,7 @@ class WorkflowTrace:
     final_output: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AgentFeedback:
     """Feedback for a specific agent."""
     agent_id: str
@@ -64,7 +68,7 @@ class AgentFeedback:
     suggested_fix: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class EvaluationResult:
     """Result of output evaluation."""
     score: float
@@ -73,7 +77,7 @@ class EvaluationResult:
     metrics: Dict[str, float] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PromptSuggestion:
     """Suggestion for updating an agent's prompt."""
     agent_id: str
@@ -82,7 +86,7 @@ class PromptSuggestion:
     confidence: float = 0.0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class OptimizationIteration:
     """Information about a single optimization iteration."""
     iteration: int
@@ -96,7 +100,7 @@ class OptimizationIteration:
     current_prompts: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class OptimizationConfig:
     """Configuration for the optimization process."""
     max_iterations: int = 5
@@ -107,9 +111,10 @@ class OptimizationConfig:
     plateau_patience: int = 3
     aggregation_strategy: AggregationStrategy = AggregationStrategy.AVERAGE
     max_llm_retries_per_iteration: int = 3
+    max_concurrent_evaluations: int = 4
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class OptimizationResult:
     """Final result of the optimization process."""
     final_score: float
@@ -125,7 +130,7 @@ class OptimizationResult:
     llm_format_errors: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class InputOutputPair:
     """A single input-output pair for evaluation."""
     input_data: Any
@@ -133,14 +138,14 @@ class InputOutputPair:
     weight: float = 1.0  # Weight for this pair in aggregation
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TargetConfig:
     """Configuration for target/expected output files."""
     target_path: str  # Path to the expected output file
     weight: float = 1.0  # Weight for this target in aggregation
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class OptimizationInput:
     """Input data for the optimization process."""
     agent_config: Dict[str, Any]
@@ -179,42 +184,160 @@ class AgentConfigUpdater:
     
     @staticmethod
     def update_agent_prompt(config: Dict[str, Any], agent_id: str, new_prompt: str) -> Dict[str, Any]:
-        """Update the prompt for a specific agent in the configuration."""
-        updated_config = json.loads(json.dumps(config))  # Deep copy
+        """
+        Update the prompt for a specific agent in the configuration.
+        
+        The input is left untouched. Only the agent dicts and sub_agents lists on the
+        path to the updated agent are copied; all other subtrees are shared with the
+        input, so configurations must be treated as immutable once built.
+        """
+        return AgentConfigUpdater.update_and_get_old(config, agent_id, new_prompt)[0]
+    
+    @staticmethod
+    def update_and_get_old(
+        config: Dict[str, Any],
+        agent_id: str,
+        new_prompt: str
+    ) -> Tuple[Dict[str, Any], str, bool]:
+        """
+        Update an agent prompt and report the prompt it replaced, in one walk.
         
-        def update_recursive(agent_dict: Dict[str, Any], target_id: str, prompt: str) -> bool:
-            if agent_dict.get('name') == target_id:
-                agent_dict['instruction'] = prompt
-                return True
+        Args:
+            config: Agent configuration (not mutated)
+            agent_id: Name of the agent to update
+            new_prompt: New instruction for the agent
             
-            if 'sub_agents' in agent_dict:
-                for sub_agent in agent_dict['sub_agents']:
-                    if update_recursive(sub_agent, target_id, prompt):
-                        return True
+        Returns:
+            Tuple of (updated_config, old_prompt, found). When the agent is not
+            found the input config is returned with an empty old prompt.
+        """
+        path = AgentConfigUpdater._find_agent_path(config, agent_id)
+        if path is None:
+            return config, "", False
+        
+        updated_config, old_prompt = AgentConfigUpdater.apply_prompt_at_path(config, path, new_prompt)
+        return updated_config, old_prompt, True
+    
+    @staticmethod
+    def build_name_index(config: Dict[str, Any]) -> Dict[str, Tuple[int, ...]]:
+        """
+        Map each agent name to its sub_agents index path, in one walk.
+        
+        Prompt updates never change the agent tree's shape, so the index stays valid
+        for configs derived from this one by apply_prompt_at_path. Duplicate names
+        map to their first agent in pre-order, matching update_agent_prompt.
+        """
+        index: Dict[str, Tuple[int, ...]] = {}
+        for agent_dict, path in AgentConfigUpdater._iter_agent_paths(config):
+            name = agent_dict.get('name')
+            if name is not None and name not in index:
+                index[name] = path
+        return index
+    
+    @staticmethod
+    def apply_prompt_at_path(
+        config: Dict[str, Any],
+        path: Tuple[int, ...],
+        new_prompt: str
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Set the instruction of the agent at a sub_agents index path.
+        
+        Args:
+            config: Agent configuration (not mutated)
+            path: Index path from build_name_index
+            new_prompt: New instruction for the agent
+            
+        Returns:
+            Tuple of (updated_config, old_prompt). Only the dicts and lists along
+            the path are copied.
+        """
+        updated_config, old_prompts = AgentConfigUpdater.apply_prompts_at_paths(config, {path: new_prompt})
+        return updated_config, old_prompts[path]
+    
+    @staticmethod
+    def apply_prompts_at_paths(
+        config: Dict[str, Any],
+        updates: Dict[Tuple[int, ...], str]
+    ) -> Tuple[Dict[str, Any], Dict[Tuple[int, ...], str]]:
+        """
+        Set the instructions of several agents in one pass.
+        
+        Each dict and sub_agents list on the union of the update paths is copied
+        once, however many updates share it; everything else is shared with the input.
+        
+        Args:
+            config: Agent configuration (not mutated)
+            updates: Mapping of index path (from build_name_index) to new instruction
             
-            return False
+        Returns:
+            Tuple of (updated_config, old_prompts keyed by path)
+        """
+        updated_config = dict(config)
+        copied_agents: Dict[Tuple[int, ...], Dict[str, Any]] = {(): updated_config}
+        copied_lists = set()
+        old_prompts: Dict[Tuple[int, ...], str] = {}
+        
+        for path, new_prompt in updates.items():
+            node = updated_config
+            for depth in range(len(path)):
+                child = copied_agents.get(path[:depth + 1])
+                if child is None:
+                    if path[:depth] not in copied_lists:
+                        node['sub_agents'] = list(node['sub_agents'])
+                        copied_lists.add(path[:depth])
+                    child = dict(node['sub_agents'][path[depth]])
+                    node['sub_agents'][path[depth]] = child
+                    copied_agents[path[:depth + 1]] = child
+                node = child
+            old_prompts[path] = node.get('instruction', "")
+            node['instruction'] = new_prompt
         
-        update_recursive(updated_config, agent_id, new_prompt)
-        return updated_config
+        return updated_config, old_prompts
+    
+    @staticmethod
+    def _find_agent_path(config: Dict[str, Any], agent_id: str) -> Optional[Tuple[int, ...]]:
+        """Return the sub_agents indices leading to the first agent named agent_id (pre-order)."""
+        for agent_dict, path in AgentConfigUpdater._iter_agent_paths(config):
+            if agent_dict.get('name') == agent_id:
+                return path
+        return None
+    
+    @staticmethod
+    def _iter_agent_paths(config: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], Tuple[int, ...]]]:
+        """Yield (agent dict, sub_agents index path) for every agent in pre-order."""
+        stack: List[Tuple[Dict[str, Any], Tuple[int, ...]]] = [(config, ())]
+        while stack:
+            agent_dict, path = stack.pop()
+            yield agent_dict, path
+            sub_agents = agent_dict.get('sub_agents')
+            if sub_agents:
+                stack.extend(
+                    (sub_agent, path + (index,))
+                    for index, sub_agent in reversed(list(enumerate(sub_agents)))
+                    if isinstance(sub_agent, dict)
+                )
     
     @staticmethod
     def extract_agent_prompts(config: Dict[str, Any]) -> Dict[str, str]:
         """Extract all agent prompts from the configuration."""
         prompts = {}
         
-        def extract_recursive(agent_dict: Dict[str, Any]):
+        # Pre-order walk with an explicit stack; children are pushed reversed to keep declaration order
+        stack = [config]
+        while stack:
+            agent_dict = stack.pop()
             if 'name' in agent_dict and 'instruction' in agent_dict:
                 prompts[agent_dict['name']] = agent_dict['instruction']
             
-            if 'sub_agents' in agent_dict:
-                for sub_agent in agent_dict['sub_agents']:
-                    extract_recursive(sub_agent)
+            sub_agents = agent_dict.get('sub_agents')
+            if sub_agents:
+                stack.extend(sub_agent for sub_agent in reversed(sub_agents) if isinstance(sub_agent, dict))
         
-        extract_recursive(config)
         return prompts
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScoringMetrics:
     """Metrics for evaluating output quality."""
     semantic_similarity: float = 0.0
@@ -223,22 +346,48 @@ class ScoringMetrics:
     rouge_score: float = 0.0
     custom_score: float = 0.0
     
+    _DEFAULT_WEIGHTS: ClassVar[Dict[str, float]] = {
+        'semantic_similarity': 0.4,
+        'exact_match': 0.2,
+        'bleu_score': 0.2,
+        'rouge_score': 0.2
+    }
+    
     def weighted_average(self, weights: Dict[str, float] = None) -> float:
         """Calculate weighted average of all metrics."""
+        return self.weighted_average_batch([self], weights)[0]
+    
+    @classmethod
+    def weighted_average_batch(
+        cls,
+        metrics_list: List['ScoringMetrics'],
+        weights: Dict[str, float] = None
+    ) -> List[float]:
+        """
+        Calculate the weighted average of each metrics record with shared weights.
+        
+        Weights naming unknown metrics are dropped and the total weight is computed
+        once for the whole batch, leaving one multiply-add per metric per record.
+        
+        Args:
+            metrics_list: Metrics records to score
+            weights: Weight per metric name (defaults to the standard weighting)
+            
+        Returns:
+            Weighted average for each record, in order
+        """
         if weights is None:
-            weights = {
-                'semantic_similarity': 0.4,
-                'exact_match': 0.2,
-                'bleu_score': 0.2,
-                'rouge_score': 0.2
-            }
-        
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for metric, weight in weights.items():
-            if hasattr(self, metric):
-                total_score += getattr(self, metric) * weight
-                total_weight += weight
-        
-        return total_score / total_weight if total_weight > 0 else 0.0
\ No newline at end of file
+            weights = cls._DEFAULT_WEIGHTS
+        
+        metric_weights = [(metric, weight) for metric, weight in weights.items() if metric in _SCORING_FIELDS]
+        total_weight = sum(weight for _, weight in metric_weights)
+        if total_weight <= 0:
+            return [0.0] * len(metrics_list)
+        
+        return [
+            sum(getattr(metrics, metric) * weight for metric, weight in metric_weights) / total_weight
+            for metrics in metrics_list
+        ]
+
+
+_SCORING_FIELDS = frozenset(scoring_field.name for scoring_field in fields(ScoringMetrics))
@@ -2,10 +2,12 @@
 Prompt Updater - Applies prompt changes to agent configurations.
 """
 
+import hashlib
 import json
 import logging
-from typing import Dict, Any, List, Optional, Tuple
-from copy import deepcopy
+from collections import deque
+from itertools import islice
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 from .types import PromptSuggestion, AgentConfigUpdater
 
@@ -15,14 +17,22 @@ logger = logging.getLogger(__name__)
 class PromptUpdater:
     """Updates agent prompts in configurations while preserving structure."""
     
-    def __init__(self):
+    def __init__(self, keep_full_prompts: bool = False, max_history: Optional[int] = 100):
+        """
+        Args:
+            keep_full_prompts: Record full old/new prompt text in update_history
+                               instead of lengths and digests (for debugging)
+            max_history: Number of most recent apply_suggestions calls kept in
+                         update_history (None keeps all)
+        """
         self.config_updater = AgentConfigUpdater()
-        self.update_history = []
+        self.keep_full_prompts = keep_full_prompts
+        self.update_history = deque(maxlen=max_history)
     
     def apply_suggestions(
         self,
         agent_config: Dict[str, Any],
-        suggestions: List[PromptSuggestion],
+        suggestions: Iterable[PromptSuggestion],
         max_suggestions: Optional[int] = None
     ) -> Tuple[Dict[str, Any], List[PromptSuggestion]]:
         """
@@ -30,58 +40,77 @@ class PromptUpdater:
         
         Args:
             agent_config: Current agent configuration
-            suggestions: List of prompt suggestions to apply
+            suggestions: Prompt suggestions to apply (any iterable, e.g. a stream)
             max_suggestions: Maximum number of suggestions to apply
             
         Returns:
             Tuple of (updated_config, applied_suggestions)
         """
-        updated_config = deepcopy(agent_config)
         applied_suggestions = []
         
-        # Limit number of suggestions if specified
+        # Limit number of suggestions if specified; islice stops pulling from a stream at the limit
         if max_suggestions:
-            suggestions = suggestions[:max_suggestions]
+            suggestions = list(islice(suggestions, max_suggestions))
+        elif not isinstance(suggestions, list):
+            suggestions = list(suggestions)
         
         # Track changes for history
         changes = []
         
+        # Locate every agent once, then write all prompts in a single path-copying pass.
+        # Only the last suggestion per agent reaches the config, exactly as if they were
+        # applied one after another; the earlier ones are still replayed below for history.
+        name_index = self.config_updater.build_name_index(agent_config)
+        latest: Dict[str, PromptSuggestion] = {}
         for suggestion in suggestions:
-            try:
-                # Get current prompt before update
-                current_prompts = self.config_updater.extract_agent_prompts(updated_config)
-                old_prompt = current_prompts.get(suggestion.agent_id, "")
-                logger.info(f"Updating {suggestion.agent_id}: old_prompt={len(old_prompt)} chars")
-                
-                # Apply the suggestion
-                updated_config = self.config_updater.update_agent_prompt(
-                    updated_config,
-                    suggestion.agent_id,
-                    suggestion.new_prompt
-                )
-                
-                # Verify the update was successful
-                new_prompts = self.config_updater.extract_agent_prompts(updated_config)
-                new_prompt = new_prompts.get(suggestion.agent_id, "")
-                logger.info(f"After update {suggestion.agent_id}: new_prompt={len(new_prompt)} chars")
-                
-                if new_prompt != old_prompt:
-                    applied_suggestions.append(suggestion)
-                    changes.append({
-                        'agent_id': suggestion.agent_id,
-                        'old_prompt': old_prompt,
-                        'new_prompt': new_prompt,
-                        'reason': suggestion.reason,
-                        'confidence': suggestion.confidence
-                    })
-                    logger.info(f"Applied suggestion for {suggestion.agent_id}: {suggestion.reason}")
-                    logger.info(f"Old prompt = {old_prompt}, New prompt = {new_prompt}")
-                else:
-                    logger.warning(f"Failed to apply suggestion for {suggestion.agent_id}")
-                    
-            except Exception as e:
-                logger.error(f"Error applying suggestion for {suggestion.agent_id}: {str(e)}")
+            if suggestion.agent_id in name_index:
+                latest[suggestion.agent_id] = suggestion
+            else:
+                logger.warning("Failed to apply suggestion for %s: agent not found", suggestion.agent_id)
+        
+        updated_config, old_prompts = self.config_updater.apply_prompts_at_paths(
+            agent_config,
+            {name_index[agent_id]: suggestion.new_prompt for agent_id, suggestion in latest.items()}
+        )
+        
+        # Replay suggestions in order so each one, including any later superseded, is
+        # compared against the prompt it would have replaced and recorded in history
+        current_prompts = {agent_id: old_prompts[name_index[agent_id]] for agent_id in latest}
+        for suggestion in suggestions:
+            if suggestion.agent_id not in current_prompts:
                 continue
+            old_prompt = current_prompts[suggestion.agent_id]
+            new_prompt = suggestion.new_prompt
+            current_prompts[suggestion.agent_id] = new_prompt
+            if latest[suggestion.agent_id] is not suggestion:
+                logger.info("Suggestion for %s is superseded by a later one in this batch", suggestion.agent_id)
+            logger.info(
+                "Updated %s: old_prompt=%d chars, new_prompt=%d chars",
+                suggestion.agent_id, len(old_prompt), len(new_prompt)
+            )
+            
+            if new_prompt != old_prompt:
+                applied_suggestions.append(suggestion)
+                change = {
+                    'agent_id': suggestion.agent_id,
+                    'reason': suggestion.reason,
+                    'confidence': suggestion.confidence
+                }
+                if self.keep_full_prompts:
+                    change['old_prompt'] = old_prompt
+                    change['new_prompt'] = new_prompt
+                else:
+                    change.update(
+                        old_len=len(old_prompt),
+                        new_len=len(new_prompt),
+                        old_hash=self._prompt_digest(old_prompt),
+                        new_hash=self._prompt_digest(new_prompt)
+                    )
+                changes.append(change)
+                logger.info("Applied suggestion for %s: %s", suggestion.agent_id, suggestion.reason)
+                logger.debug("Old prompt = %s, New prompt = %s", old_prompt, new_prompt)
+            else:
+                logger.warning("Failed to apply suggestion for %s", suggestion.agent_id)
         
         # Add to history
         self.update_history.append({
@@ -92,6 +121,11 @@ class PromptUpdater:
         
         return updated_config, applied_suggestions
     
+    @staticmethod
+    def _prompt_digest(prompt: str) -> str:
+        """Short stable digest identifying a prompt in update history."""
+        return hashlib.blake2b(prompt.encode('utf-8'), digest_size=8).hexdigest()
+    
     def validate_configuration(self, config: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """
         Validate that the configuration is still valid after updates.
@@ -116,11 +150,11 @@ class PromptUpdater:
                 if field not in config:
                     errors.append(f"Missing required field: {field}")
             
-            # Validate agent structure recursively
-            self._validate_agent_structure(config, errors, "root")
+            # Validate agent structure, collecting prompts in the same walk
+            prompts: Dict[str, Any] = {}
+            self._validate_agent_structure(config, errors, "root", prompts)
             
             # Check for empty prompts
-            prompts = self.config_updater.extract_agent_prompts(config)
             for agent_id, prompt in prompts.items():
                 if not prompt or not prompt.strip():
                     errors.append(f"Empty prompt for agent: {agent_id}")
@@ -137,49 +171,69 @@ class PromptUpdater:
         self,
         agent_dict: Dict[str, Any],
         errors: List[str],
-        path: str
+        path: str,
+        prompts: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Recursively validate agent structure."""
-        if not isinstance(agent_dict, dict):
-            errors.append(f"Agent at {path} must be a dictionary")
-            return
-        
-        # Check for required fields in agents
-        if 'name' in agent_dict:
-            if 'class' not in agent_dict:
-                errors.append(f"Agent {path} missing 'class' field")
-            if 'module' not in agent_dict:
-                errors.append(f"Agent {path} missing 'module' field")
-        
-        # Validate sub-agents
-        if 'sub_agents' in agent_dict:
-            if not isinstance(agent_dict['sub_agents'], list):
+        """
+        Validate agent structure, walking sub-agents with an explicit stack.
+        
+        When prompts is given, it is filled like extract_agent_prompts (last agent
+        with a name wins) so callers need no second walk.
+        """
+        stack = [(agent_dict, path)]
+        while stack:
+            agent_dict, path = stack.pop()
+            if not isinstance(agent_dict, dict):
+                errors.append(f"Agent at {path} must be a dictionary")
+                continue
+            
+            # Check for required fields in agents
+            if 'name' in agent_dict:
+                if prompts is not None and 'instruction' in agent_dict:
+                    prompts[agent_dict['name']] = agent_dict['instruction']
+                if 'class' not in agent_dict:
+                    errors.append(f"Agent {path} missing 'class' field")
+                if 'module' not in agent_dict:
+                    errors.append(f"Agent {path} missing 'module' field")
+            
+            # Validate sub-agents, pushed in reverse so errors are reported in declaration order
+            sub_agents = agent_dict.get('sub_agents')
+            if isinstance(sub_agents, list):
+                stack.extend(
+                    (sub_agents[i], f"{path}.sub_agents[{i}]") for i in reversed(range(len(sub_agents)))
+                )
+            elif 'sub_agents' in agent_dict:
                 errors.append(f"sub_agents at {path} must be a list")
-            else:
-                for i, sub_agent in enumerate(agent_dict['sub_agents']):
-                    sub_path = f"{path}.sub_agents[{i}]"
-                    self._validate_agent_structure(sub_agent, errors, sub_path)
     
     def _check_circular_references(self, config: Dict[str, Any], errors: List[str]) -> None:
         """Check for circular references in agent structure."""
         visited = set()
         
-        def check_agent(agent_dict: Dict[str, Any], path: List[str]):
+        # (agent, ancestor names); an agent of None marks leaving the last ancestor
+        stack: List[Tuple[Optional[Dict[str, Any]], List[str]]] = [(config, [])]
+        while stack:
+            agent_dict, path = stack.pop()
+            if agent_dict is None:
+                visited.remove(path[-1])
+                continue
+            
             agent_name = agent_dict.get('name', 'unnamed')
             
             if agent_name in visited:
                 errors.append(f"Circular reference detected: {' -> '.join(path + [agent_name])}")
-                return
+                continue
             
             visited.add(agent_name)
+            agent_path = path + [agent_name]
+            stack.append((None, agent_path))
             
-            if 'sub_agents' in agent_dict:
-                for sub_agent in agent_dict['sub_agents']:
-                    check_agent(sub_agent, path + [agent_name])
-            
-            visited.remove(agent_name)
-        
-        check_agent(config, [])
+            sub_agents = agent_dict.get('sub_agents')
+            if sub_agents:
+                stack.extend(
+                    (sub_agent, agent_path)
+                    for sub_agent in reversed(sub_agents)
+                    if isinstance(sub_agent, dict)
+                )
     
     def get_prompt_diff(
         self,
@@ -201,16 +255,21 @@ class PromptUpdater:
         
         diff = {}
         
-        # Find changed prompts
-        for agent_id in set(old_prompts.keys()) | set(new_prompts.keys()):
-            old_prompt = old_prompts.get(agent_id, "")
+        # Find changed or removed prompts, then prompts only present in the new config
+        for agent_id, old_prompt in old_prompts.items():
             new_prompt = new_prompts.get(agent_id, "")
-            
             if old_prompt != new_prompt:
                 diff[agent_id] = {
                     'old': old_prompt,
                     'new': new_prompt
                 }
         
+        for agent_id, new_prompt in new_prompts.items():
+            if agent_id not in old_prompts and new_prompt != "":
+                diff[agent_id] = {
+                    'old': "",
+                    'new': new_prompt
+                }
+        
         return diff
     
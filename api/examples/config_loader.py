@@ -7,17 +7,41 @@ This script reads the existing configuration files and creates a JSON payload re
 import json
 import sys
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+@lru_cache(maxsize=32)
+def _load_cached(path_str, mtime_ns):
+    """Parse a YAML file; keyed on modification time so edited files are re-read."""
+    with open(path_str, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
 def load_config_file(file_path):
-    """Load YAML configuration file and parse it into a Python object."""
+    """
+    Load YAML configuration file and parse it into a Python object.
+    
+    Parses are cached per file and modification time; the returned object is shared
+    between calls and must not be mutated.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        path = Path(file_path).resolve()
+        return _load_cached(str(path), path.stat().st_mtime_ns)
     except FileNotFoundError:
         print(f"Error: Configuration file not found: {file_path}")
         return None
@@ -41,10 +65,11 @@ def create_api_payload(job_name: str = "simple_code_improvement"):
     print(f"🤖 Agent config: {agent_config_path}")
     print(f"📝 Template config: {template_config_path}")
     
-    # Load configurations
-    job_config = load_config_file(job_config_path)
-    agent_config = load_config_file(agent_config_path)
-    template_config = load_config_file(template_config_path)
+    # Load configurations concurrently; the reads are independent and I/O bound
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        job_config, agent_config, template_config = executor.map(
+            load_config_file, [job_config_path, agent_config_path, template_config_path]
+        )
     
     if not all([job_config, agent_config, template_config]):
         print("❌ Failed to load one or more configuration files")
@@ -67,8 +92,12 @@ def create_api_payload(job_name: str = "simple_code_improvement"):
 def save_payload_to_file(payload, output_file):
     """Save the API payload to a JSON file."""
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(payload, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
         print(f"💾 API payload saved to: {output_file}")
         return True
     except Exception as e:
@@ -9,9 +9,19 @@ import json
 import time
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # API endpoint
 API_URL = "http://localhost:8000/workflow/run"
 
+# One pooled connection reused by every call instead of a new connection per request
+SESSION = requests.Session()
+SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
 def load_config_file(file_path):
     """Load configuration file content."""
     try:
@@ -40,10 +50,19 @@ def call_workflow_api(job_config, agent_config, template_config):
         print(f"📝 Template config length: {len(template_config)} characters")
         print("-" * 60)
         
-        response = requests.post(API_URL, json=payload, timeout=600)  # 10 minute timeout
+        if ORJSON_AVAILABLE:
+            # Encode and decode the bodies as bytes in C, skipping requests' stdlib json round trip
+            response = SESSION.post(
+                API_URL,
+                data=orjson.dumps(payload),
+                headers={'Content-Type': 'application/json'},
+                timeout=600  # 10 minute timeout
+            )
+        else:
+            response = SESSION.post(API_URL, json=payload, timeout=600)  # 10 minute timeout
         
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
         else:
             print(f"❌ API Error: {response.status_code}")
             print(f"Error details: {response.text}")
@@ -59,11 +78,19 @@ def call_workflow_api(job_config, agent_config, template_config):
         print(f"❌ Request failed: {e}")
         return None
 
+def write_json_file(data, output_file):
+    """Write data as indented JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(data, f, indent=2)
+
 def save_response_to_file(response_data, output_file):
     """Save the API response to a file."""
     try:
-        with open(output_file, 'w') as f:
-            json.dump(response_data, f, indent=2)
+        write_json_file(response_data, output_file)
         print(f"💾 Response saved to: {output_file}")
         return True
     except Exception as e:
@@ -126,8 +153,7 @@ def main():
         if response_data.get('execution_results'):
             results_file = project_root / "api/execution_results.json"
             try:
-                with open(results_file, 'w') as f:
-                    json.dump(response_data['execution_results'], f, indent=2)
+                write_json_file(response_data['execution_results'], results_file)
                 print(f"📊 Execution results saved to: {results_file}")
             except Exception as e:
                 print(f"❌ Error saving execution results: {e}")
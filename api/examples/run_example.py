@@ -5,41 +5,47 @@ This script demonstrates the full workflow.
 """
 
 import subprocess
+import threading
 import time
 import sys
 from pathlib import Path
 
-def start_server():
-    """Start the FastAPI server."""
+# Add the project root to the Python path so the API app can be imported in-process
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+HEALTH_URL = "http://localhost:8000/health"
+
+def start_server(startup_timeout=5.0, poll_interval=0.05):
+    """Start the FastAPI server in a background thread of this process."""
     print("🚀 Starting FastAPI server...")
     
-    # Change to API directory
-    api_dir = Path(__file__).parent
-    
-    # Start the server process
     try:
-        process = subprocess.Popen(
-            [sys.executable, "main.py"],
-            cwd=api_dir,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        import requests
+        import uvicorn
+        from api.main import app
+        from example_client import SESSION
+        
+        config = uvicorn.Config(app, host="127.0.0.1", port=8000, log_level="warning")
+        server = uvicorn.Server(config)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
         
-        # Wait a bit for server to start
+        # Poll the health endpoint instead of sleeping a fixed time
         print("⏳ Waiting for server to start...")
-        time.sleep(3)
+        deadline = time.monotonic() + startup_timeout
+        while time.monotonic() < deadline and thread.is_alive():
+            try:
+                if SESSION.get(HEALTH_URL, timeout=1).status_code == 200:
+                    print("✅ Server started successfully")
+                    return server, thread
+            except requests.exceptions.ConnectionError:
+                pass
+            time.sleep(poll_interval)
         
-        # Check if server is still running
-        if process.poll() is None:
-            print("✅ Server started successfully")
-            return process
-        else:
-            stdout, stderr = process.communicate()
-            print(f"❌ Server failed to start")
-            print(f"STDOUT: {stdout}")
-            print(f"STDERR: {stderr}")
-            return None
+        print(f"❌ Server failed to start")
+        server.should_exit = True
+        return None
             
     except Exception as e:
         print(f"❌ Error starting server: {e}")
@@ -47,9 +53,9 @@ def start_server():
 
 def check_server_health():
     """Check if the server is responding."""
-    import requests
+    from example_client import SESSION
     try:
-        response = requests.get("http://localhost:8000/health", timeout=5)
+        response = SESSION.get(HEALTH_URL, timeout=5)
         if response.status_code == 200:
             print("✅ Server health check passed")
             return True
@@ -94,15 +100,15 @@ def main():
     print("This script will:")
     print("1. Start the FastAPI server")
     print("2. Run the example client")
-    print("3. Clean up the server process")
+    print("3. Stop the server")
     print("-" * 60)
     
-    server_process = None
+    server = None
     
     try:
         # Start server
-        server_process = start_server()
-        if not server_process:
+        server = start_server()
+        if not server:
             return 1
         
         # Health check
@@ -127,18 +133,16 @@ def main():
         print("\n🛑 Interrupted by user")
         
     finally:
-        # Clean up server process
-        if server_process and server_process.poll() is None:
+        # Clean up server thread
+        if server:
+            uvicorn_server, thread = server
             print("🧹 Stopping server...")
-            server_process.terminate()
-            try:
-                server_process.wait(timeout=5)
+            uvicorn_server.should_exit = True
+            thread.join(timeout=5)
+            if thread.is_alive():
+                print("⚠️  Server didn't stop gracefully; it exits with the process")
+            else:
                 print("✅ Server stopped")
-            except subprocess.TimeoutExpired:
-                print("⚠️  Server didn't stop gracefully, killing...")
-                server_process.kill()
-                server_process.wait()
-                print("✅ Server killed")
     
     return 0
 
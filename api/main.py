@@ -1,9 +1,13 @@
+import asyncio
+import importlib.util
+import json
 import logging
 import sys
 import os
-import yaml
+from typing import Any, Dict
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 # import uuid generator
 import uuid
 
@@ -11,29 +15,79 @@ import uuid
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from core.flexible_agents import main_async_with_config
+from core.flexible_agents import main_async_with_dicts
 from api.models import WorkflowRequest, WorkflowResponse
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Configure logging; LOG_LEVEL=INFO restores per-request progress messages
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "WARNING").strip().upper()
+_log_level = logging.getLevelName(LOG_LEVEL)  # an int for known level names
+logging.basicConfig(level=_log_level if isinstance(_log_level, int) else logging.WARNING)
 logger = logging.getLogger(__name__)
+if not isinstance(_log_level, int):
+    logger.warning(f"Unknown LOG_LEVEL {LOG_LEVEL!r}, using WARNING")
 
 app = FastAPI(
     title="Flexible Agent API",
     description="API for running flexible agent workflows",
-    version="1.0.0"
+    version="1.0.0",
+    # Encode responses (including large execution_results) with orjson when installed
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
+# Browser origins allowed to call the API, comma-separated (e.g. "https://app.example.com")
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
+    if origin.strip()
+]
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    # Let browsers cache preflight responses for a day
+    max_age=86400,
 )
 
 
+def _build_workflow_response(exit_code, results) -> WorkflowResponse:
+    """Turn the workflow's exit code and results into a WorkflowResponse."""
+    if exit_code == 0:
+        # Success case - return the actual results
+        return WorkflowResponse(
+            status="completed",
+            output_file=results.get("output_file"),
+            json_file=results.get("json_file"),
+            events_generated=results.get("events_generated"),
+            response_length=results.get("response_length"),
+            execution_results=results.get("execution_results"),
+            error_message=None
+        )
+    else:
+        # Error case - results dictionary contains error information
+        return WorkflowResponse(
+            status="failed",
+            error_message=results.get("error_message", "Workflow execution failed"),
+            execution_results=results if isinstance(results, dict) else None
+        )
+
+
+def _encode_event(event: Dict[str, Any]) -> bytes:
+    """Encode one streamed event as a newline-terminated JSON line."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(event) + b"\n"
+    return (json.dumps(event) + "\n").encode("utf-8")
+
+
 @app.post("/workflow/run", response_model=WorkflowResponse)
 async def run_workflow(request: WorkflowRequest):
     """
@@ -48,37 +102,15 @@ async def run_workflow(request: WorkflowRequest):
     try:
         logger.info("Starting workflow execution")
         
-        # Convert JSON objects to YAML strings for the main_async_with_config function
-        job_config_yaml = yaml.dump(request.job_config, default_flow_style=False)
-        agent_config_yaml = yaml.dump(request.agent_config, default_flow_style=False)
-        template_config_yaml = yaml.dump(request.template_config, default_flow_style=False)
-        
-        # Call the main async function with the provided configurations
-        exit_code, results = await main_async_with_config(
-            job_config_content=job_config_yaml,
-            agent_config_content=agent_config_yaml,
-            template_config_content=template_config_yaml,
+        # Pass the parsed request configurations straight through; each request owns its dicts
+        exit_code, results = await main_async_with_dicts(
+            job_config=request.job_config,
+            agent_config=request.agent_config,
+            template_config=request.template_config,
             uuid=str(uuid.uuid4())
         )
         
-        if exit_code == 0:
-            # Success case - return the actual results
-            return WorkflowResponse(
-                status="completed",
-                output_file=results.get("output_file"),
-                json_file=results.get("json_file"),
-                events_generated=results.get("events_generated"),
-                response_length=results.get("response_length"),
-                execution_results=results.get("execution_results"),
-                error_message=None
-            )
-        else:
-            # Error case - results dictionary contains error information
-            return WorkflowResponse(
-                status="failed",
-                error_message=results.get("error_message", "Workflow execution failed"),
-                execution_results=results if isinstance(results, dict) else None
-            )
+        return _build_workflow_response(exit_code, results)
             
     except Exception as e:
         logger.error(f"Error running workflow: {str(e)}")
@@ -88,6 +120,55 @@ async def run_workflow(request: WorkflowRequest):
         )
 
 
+@app.post("/workflow/stream")
+async def stream_workflow(request: WorkflowRequest):
+    """
+    Run a flexible agent workflow and stream its progress as newline-delimited JSON.
+    
+    Each agent's final response is sent as an "agent_response" event as soon as it
+    arrives, so clients see the first step without waiting for the whole pipeline.
+    The last line is a "result" event carrying the same fields as /workflow/run.
+    
+    Args:
+        request: WorkflowRequest containing job_config, agent_config, and template_config
+        
+    Returns:
+        StreamingResponse of application/x-ndjson events
+    """
+    logger.info("Starting streamed workflow execution")
+    events: asyncio.Queue = asyncio.Queue()
+    
+    async def run_and_close():
+        try:
+            exit_code, results = await main_async_with_dicts(
+                job_config=request.job_config,
+                agent_config=request.agent_config,
+                template_config=request.template_config,
+                uuid=str(uuid.uuid4()),
+                event_queue=events
+            )
+            response = _build_workflow_response(exit_code, results)
+        except Exception as e:
+            logger.error(f"Error running workflow: {str(e)}")
+            response = WorkflowResponse(status="failed", error_message=f"Error running workflow: {str(e)}")
+        
+        events.put_nowait({"type": "result", **response.model_dump()})
+        # None marks the end of the stream
+        events.put_nowait(None)
+    
+    workflow = asyncio.create_task(run_and_close())
+    
+    async def event_iter():
+        try:
+            while (event := await events.get()) is not None:
+                yield _encode_event(event)
+        finally:
+            # Stop the workflow if the client disconnects early
+            workflow.cancel()
+    
+    return StreamingResponse(event_iter(), media_type="application/x-ndjson")
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -102,11 +183,29 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "run_workflow": "/workflow/run",
+            "stream_workflow": "/workflow/stream",
             "health": "/health"
         }
     }
 
 
 if __name__ == "__main__":
+    # Each worker is a full process with its own agents and LLM clients, so keep the
+    # previous fixed default of 4; set WEB_CONCURRENCY to change it (gunicorn reads it too)
+    workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+    
+    # Opt in with USE_GUNICORN=1 to have gunicorn supervise Uvicorn workers (POSIX only).
+    # It runs as "python -m gunicorn" so it uses this interpreter and its packages.
+    if os.environ.get("USE_GUNICORN") == "1" and importlib.util.find_spec("gunicorn"):
+        os.execv(sys.executable, [
+            sys.executable, "-m", "gunicorn", "main:app",
+            "--chdir", os.path.dirname(os.path.abspath(__file__)),
+            "-k", "uvicorn.workers.UvicornWorker",
+            "-w", str(workers),
+            "-b", "0.0.0.0:8000"
+        ])
+    
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=4)
\ No newline at end of file
+    # "auto" selects uvloop and httptools when installed (uvicorn[standard]) and falls back otherwise
+    # Per-request access log lines are the main logging cost, so leave them off
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers, loop="auto", http="auto", access_log=False)
\ No newline at end of file
@@ -9,6 +9,7 @@ with LiteLLM as the model provider to access OpenAI's GPT-4o.
 import os
 import sys
 import asyncio
+import functools
 from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk import Runner
@@ -21,6 +22,11 @@ from google.adk.models.llm_response import LlmResponse
 from google.adk.models.lite_llm import LiteLlm
 import re
 
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.http_pool import configure_litellm_http_pool
+
 # Import LangChain wrapper
 current_dir = os.path.dirname(__file__)
 wrapper_dir = os.path.join(os.path.dirname(current_dir), 'wrapper')
@@ -40,6 +46,9 @@ load_dotenv()
 def create_agent(model="openai:gpt-4o", name="LiteLLMAssistant", instruction=None, tools=None, use_langchain=False):
     """Create and configure a Google ADK agent with configurable model backend.
     
+    Each call returns a new Agent (ADK agents can only have one parent), but the
+    model backends behind them are built once and shared.
+    
     Args:
         model: Model string (e.g., "openai:gpt-4o", "anthropic:claude-3-sonnet", "gpt-3.5-turbo")
         name: Agent name
@@ -69,25 +78,22 @@ You have access to the following tools to provide accurate, real-time informatio
 
 IMPORTANT: When a user asks a question that matches these tool capabilities, you MUST call the appropriate tool to get real-time data instead of giving generic responses. Use tools when the user's question relates to time in Taipei, weather/temperature information, or when they need current/search information."""
     
+    # Reuse pooled provider connections when called on a running event loop
+    configure_litellm_http_pool()
+    
     # Create the model based on the chosen backend
     if use_langchain and LANGCHAIN_AVAILABLE:
         # Use LangChain wrapper
         try:
-            langchain_model = init_chat_model(model)
-            llm_model = create_langchain_litellm_wrapper(
-                langchain_model=langchain_model,
-                model=model.replace(":", "/"),  # Convert to LiteLLM format
-                temperature=0.7,
-                max_tokens=1000
-            )
+            llm_model = _langchain_backend(model)
             print(f"✓ Created agent with LangChain wrapper for model: {model}")
         except Exception as e:
             print(f"❌ Failed to create LangChain wrapper: {e}")
             print("Falling back to LiteLlm")
-            llm_model = LiteLlm(model='openai/gpt-4o')
+            llm_model = _litellm_backend('openai/gpt-4o')
     else:
         # Use standard LiteLlm
-        llm_model = LiteLlm(model='openai/gpt-4o')
+        llm_model = _litellm_backend('openai/gpt-4o')
         if use_langchain and not LANGCHAIN_AVAILABLE:
             print("⚠️  LangChain wrapper requested but not available, using LiteLlm")
     
@@ -100,12 +106,51 @@ IMPORTANT: When a user asks a question that matches these tool capabilities, you
     return agent
 
 
+@functools.lru_cache(maxsize=32)
+def _litellm_backend(model_name):
+    """Build the LiteLlm backend for a model once; agents can share it."""
+    return LiteLlm(model=model_name)
+
+
+@functools.lru_cache(maxsize=32)
+def _langchain_backend(model):
+    """Build the LangChain wrapper for a model once; failures raise and are not cached."""
+    langchain_model = init_chat_model(model)
+    return create_langchain_litellm_wrapper(
+        langchain_model=langchain_model,
+        model=model.replace(":", "/"),  # Convert to LiteLLM format
+        temperature=0.7,
+        max_tokens=1000
+    )
+
+
+def _extract_event_text(event) -> str:
+    """Return the text carried by one runner event.
+    
+    Content parts take precedence, then a bare text attribute, then the event's
+    string form. Missing attributes are handled with getattr defaults instead of
+    hasattr checks, so each attribute is looked up once.
+    """
+    content = getattr(event, 'content', None)
+    if content:
+        parts = getattr(content, 'parts', None)
+        if parts:
+            return ''.join(text for part in parts if (text := getattr(part, 'text', None)))
+        return str(content)
+    try:
+        return event.text
+    except AttributeError:
+        return str(event)
+
+
 async def run_agent_example(agent=None):
     """Run a simple example with the agent."""
     
     # Create the agent and runner
     if agent is None:
         agent = create_agent()
+    # Reuse pooled provider connections on this event loop
+    configure_litellm_http_pool()
     session_service = InMemorySessionService()
     runner = Runner(
         app_name="LiteLLMAgentExample",
@@ -113,13 +158,6 @@ async def run_agent_example(agent=None):
         session_service=session_service
     )
     
-    # Create a session for our test
-    session = await session_service.create_session(
-        user_id="test_user", 
-        session_id="test_session",
-        app_name="LiteLLMAgentExample"
-    )
-    
     # Example queries to test the agent
     test_queries = [
         "Hello! What can you help me with?",
@@ -130,42 +168,43 @@ async def run_agent_example(agent=None):
     print("🤖 Google ADK Agent with LiteLLM Example")
     print("=" * 50)
     
-    for i, query in enumerate(test_queries, 1):
+    async def one_query(i, query):
+        """Run one query in its own session so concurrent queries don't share history."""
+        session_id = f"test_session_{i}"
+        await session_service.create_session(
+            user_id="test_user",
+            session_id=session_id,
+            app_name="LiteLLMAgentExample"
+        )
+        
+        # Create a Content object for the query
+        message = types.Content(role="user", parts=[{"text": query}])
+        
+        # Run the agent with the query
+        response_generator = runner.run_async(
+            user_id="test_user",
+            session_id=session_id,
+            new_message=message
+        )
+        
+        # Collect the response, joining once instead of concatenating per event
+        return ''.join([_extract_event_text(event) async for event in response_generator])
+    
+    # The queries are independent, so overlap their LLM round trips and print in order
+    results = await asyncio.gather(
+        *(one_query(i, query) for i, query in enumerate(test_queries, 1)),
+        return_exceptions=True
+    )
+    
+    for i, (query, result) in enumerate(zip(test_queries, results), 1):
         print(f"\n📝 Query {i}: {query}")
         print("-" * 30)
         
-        try:
-            # Create a Content object for the query
-            message = types.Content(role="user", parts=[{"text": query}])
-            
-            # Run the agent with the query
-            response_generator = runner.run(
-                user_id="test_user",
-                session_id="test_session",
-                new_message=message
-            )
-            
-            # Collect the response
-            response_text = ""
-            for event in response_generator:
-                if hasattr(event, 'content') and event.content:
-                    # Extract text from Content object properly
-                    if hasattr(event.content, 'parts') and event.content.parts:
-                        for part in event.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                response_text += part.text
-                    else:
-                        response_text += str(event.content)
-                elif hasattr(event, 'text'):
-                    response_text += event.text
-                elif str(event):
-                    response_text += str(event)
-            
-            print(f"🤖 Response: {response_text}")
-            
-        except Exception as e:
-            print(f"❌ Error: {e}")
+        if isinstance(result, Exception):
+            print(f"❌ Error: {result}")
             print("Note: Make sure you have proper API credentials configured.")
+        else:
+            print(f"🤖 Response: {result}")
 
 
 async def interactive_mode(agent=None):
@@ -173,6 +212,8 @@ async def interactive_mode(agent=None):
     
     if agent is None:
         agent = create_agent()
+    # Reuse pooled provider connections on this event loop
+    configure_litellm_http_pool()
     session_service = InMemorySessionService()
     runner = Runner(
         app_name="InteractiveLiteLLMAgent",
@@ -206,27 +247,14 @@ async def interactive_mode(agent=None):
             message = types.Content(role="user", parts=[{"text": user_input}])
             
             # Run the agent with the query
-            response_generator = runner.run(
+            response_generator = runner.run_async(
                 user_id="interactive_user",
                 session_id="interactive_session",
                 new_message=message
             )
             
-            # Collect the response
-            response_text = ""
-            for event in response_generator:
-                if hasattr(event, 'content') and event.content:
-                    # Extract text from Content object properly
-                    if hasattr(event.content, 'parts') and event.content.parts:
-                        for part in event.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                response_text += part.text
-                    else:
-                        response_text += str(event.content)
-                elif hasattr(event, 'text'):
-                    response_text += event.text
-                elif str(event):
-                    response_text += str(event)
+            # Collect the response, joining once instead of concatenating per event
+            response_text = ''.join([_extract_event_text(event) async for event in response_generator])
             
             print(f"🤖 Agent: {response_text}")
             
@@ -9,6 +9,7 @@ files, supporting flexible workflows with multiple input files.
 # Standard library imports
 import argparse
 import asyncio
+import copy
 import datetime
 import json
 import logging
@@ -17,7 +18,7 @@ import sys
 import re
 import traceback
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 # Third-party imports
 import yaml
@@ -80,7 +81,7 @@ async def run_agent(agent, user_query, job_config: dict):
         print("-" * 60)
         
         # Run agent and collect responses
-        response_generator = runner.run(
+        response_generator = runner.run_async(
             user_id=session_config.get('user_id', 'code_analyzer'),
             session_id=session_config.get('session_id', 'analysis_session'), 
             new_message=message
@@ -111,7 +112,8 @@ def get_error_code_from_event(event):
     return error_code
 
 
-async def run_job(agent, input_file_paths, execution_steps: Dict[str, ExecutionStep], workflow_config: WorkflowConfiguration):
+async def run_job(agent, input_file_paths, execution_steps: Dict[str, ExecutionStep], workflow_config: WorkflowConfiguration,
+                  event_queue: Optional[asyncio.Queue] = None):
     """
     Run the agent with input files for processing.
     
@@ -120,6 +122,7 @@ async def run_job(agent, input_file_paths, execution_steps: Dict[str, ExecutionS
         input_file_paths: List of paths to the files to process, or single path as string
         execution_steps: Dictionary of execution steps to track
         workflow_config: WorkflowConfiguration instance for all configuration needs
+        event_queue: Optional queue that receives each agent's final response as it arrives
         
     Returns:
         dict: Execution results with file paths and metadata
@@ -201,7 +204,7 @@ async def run_job(agent, input_file_paths, execution_steps: Dict[str, ExecutionS
         final_responses = {}
         event_count = 0
         
-        for event in response_generator:
+        async for event in response_generator:
             event_count += 1
 
             # Make the following paragraph a function.
@@ -240,6 +243,12 @@ async def run_job(agent, input_file_paths, execution_steps: Dict[str, ExecutionS
                                 final_response += part.text
                     logging.info(f"Final response received: {len(final_response)} characters")
                     final_responses[event.author] = final_response
+                    if event_queue is not None:
+                        event_queue.put_nowait({
+                            "type": "agent_response",
+                            "agent": event.author,
+                            "response": final_response
+                        })
             else:
                 # Even events without content are valuable for tracking
                 logging.debug(f"📨 Event {event_count}: {type(event).__name__} has no content.")
@@ -282,14 +291,46 @@ async def main_async_with_config(job_config_content: str, agent_config_content:
         int: 0 for success, 1 for failure
     """
     
+    try:
+        job_config = yaml.safe_load(job_config_content)
+        agent_config = yaml.safe_load(agent_config_content)
+        template_config = yaml.safe_load(template_config_content)
+    except Exception as e:
+        logger.error(f"\n[{uuid}] Error: {e}")
+        traceback.print_exc()
+        return 1, {'Exception': str(e), "error_message": traceback.format_exc()}
+    
+    return await main_async_with_dicts(job_config, agent_config, template_config, uuid=uuid)
+
+
+async def main_async_with_dicts(job_config: Dict, agent_config: Dict, template_config: Dict, uuid: str = "",
+                                event_queue: Optional[asyncio.Queue] = None):
+    """
+    Main async function that creates and runs the flexible agent from parsed configurations.
+    
+    Callers that already hold the configurations as dicts (e.g. the API server) use this
+    to skip a YAML dump and re-parse. The agent configuration is copied before targeted
+    file contents are attached, so the caller's dict can be reused across runs.
+    
+    Args:
+        job_config (Dict): Job configuration
+        agent_config (Dict): Agent configuration
+        template_config (Dict): Template configuration
+        event_queue (asyncio.Queue, optional): Receives agent responses while the workflow runs
+        
+    Returns:
+        int: 0 for success, 1 for failure
+    """
+    
     try:
         # Initialize WorkflowConfiguration
         workflow_config = WorkflowConfiguration()
         
         # Load configurations
-        workflow_config.load_job_config_from_content(job_config_content)
-        workflow_config.load_agent_config_from_content(agent_config_content)
-        workflow_config.load_template_config_from_content(template_config_content)
+        workflow_config.job_config = job_config
+        # Deep copy to avoid appending file contents to the caller's config
+        workflow_config.agent_config = copy.deepcopy(agent_config)
+        workflow_config.template_config = template_config
         
         job_name = workflow_config.job_config.get('job_name', 'Flexible Agent')
         logging.info(f"[{uuid}] Loaded job config: {workflow_config.job_config.get('job_name', 'Unknown')}")
@@ -328,7 +369,7 @@ async def main_async_with_config(job_config_content: str, agent_config_content:
         else:
             execution_steps = {}
         
-        results = await run_job(agent, input_files, execution_steps, workflow_config)
+        results = await run_job(agent, input_files, execution_steps, workflow_config, event_queue=event_queue)
 
         # Display results
         report_config = workflow_config.get_report_config()
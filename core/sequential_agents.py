@@ -168,14 +168,14 @@ async def run_weather_pipeline(location: str):
     print("=" * 60)
     
     try:
-        response_generator = runner.run(
+        response_generator = runner.run_async(
             user_id="weather_user",
             session_id="weather_session",
             new_message=message
         )
         
         final_response = ""
-        for event in response_generator:
+        async for event in response_generator:
             if hasattr(event, 'content') and event.content:
                 if hasattr(event.content, 'parts') and event.content.parts:
                     for part in event.content.parts:
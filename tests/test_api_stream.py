@@ -0,0 +1,94 @@
+"""
+Unit tests for the NDJSON /workflow/stream endpoint in api.main.
+"""
+
+import asyncio
+import json
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+# Add the project root to the path so we can import modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.main import app, stream_workflow
+from api.models import WorkflowRequest
+
+REQUEST_BODY = {
+    'job_config': {'job_name': 'Test'},
+    'agent_config': {'name': 'Root'},
+    'template_config': {}
+}
+
+
+class TestWorkflowStreamFraming(unittest.TestCase):
+    """Test cases for the events written to the stream."""
+
+    def test_agent_responses_then_result(self):
+        """Each agent response and the final result should be one JSON line each."""
+        async def fake_workflow(job_config, agent_config, template_config, uuid="", event_queue=None):
+            for agent in ('Writer', 'Reviewer'):
+                event_queue.put_nowait({"type": "agent_response", "agent": agent, "response": f"{agent} done"})
+            return 0, {'execution_results': {'Reviewer': 'Reviewer done'}}
+
+        with patch('api.main.main_async_with_dicts', new=fake_workflow):
+            response = TestClient(app).post("/workflow/stream", json=REQUEST_BODY)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['content-type'].startswith("application/x-ndjson"))
+        self.assertTrue(response.text.endswith("\n"))
+
+        events = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(
+            [(event['type'], event.get('agent')) for event in events],
+            [("agent_response", "Writer"), ("agent_response", "Reviewer"), ("result", None)]
+        )
+        self.assertEqual(events[-1]['status'], "completed")
+        self.assertEqual(events[-1]['execution_results'], {'Reviewer': 'Reviewer done'})
+
+    def test_workflow_exception_becomes_failed_result(self):
+        """An exception from the workflow should end the stream with a failed result."""
+        async def fake_workflow(job_config, agent_config, template_config, uuid="", event_queue=None):
+            raise RuntimeError("boom")
+
+        with patch('api.main.main_async_with_dicts', new=fake_workflow):
+            response = TestClient(app).post("/workflow/stream", json=REQUEST_BODY)
+
+        events = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['type'], "result")
+        self.assertEqual(events[0]['status'], "failed")
+        self.assertIn("boom", events[0]['error_message'])
+
+
+class TestWorkflowStreamDisconnect(unittest.IsolatedAsyncioTestCase):
+    """Test cases for clients that stop reading before the workflow finishes."""
+
+    async def test_closing_the_stream_cancels_the_workflow(self):
+        """Closing the body iterator early should cancel the running workflow task."""
+        cancelled = asyncio.Event()
+
+        async def fake_workflow(job_config, agent_config, template_config, uuid="", event_queue=None):
+            event_queue.put_nowait({"type": "agent_response", "agent": "Writer", "response": "draft"})
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch('api.main.main_async_with_dicts', new=fake_workflow):
+            response = await stream_workflow(WorkflowRequest(**REQUEST_BODY))
+            first_line = await response.body_iterator.__anext__()
+            await response.body_iterator.aclose()
+
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        self.assertEqual(json.loads(first_line)['agent'], "Writer")
+
+
+if __name__ == "__main__":
+    unittest.main()
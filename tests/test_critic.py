@@ -0,0 +1,107 @@
+"""
+Unit tests for the OutputEvaluator in agent_optimizer.critic.
+"""
+
+import asyncio
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# Add the project root to the path so we can import modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent_optimizer.critic import OutputEvaluator
+from agent_optimizer.types import AggregationStrategy, EvaluationResult, InputOutputPair
+
+
+EVALUATION_RESPONSE = '{"score": 0.6, "global_feedback": "Partially correct", "agent_feedback": []}'
+
+
+class TestMultiplePairEvaluation(unittest.IsolatedAsyncioTestCase):
+    """Test cases for evaluating several input-output pairs."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.evaluator = OutputEvaluator()
+        self.pairs = [
+            InputOutputPair(input_data="a", expected_output="alpha"),
+            InputOutputPair(input_data="b", expected_output="beta"),
+            InputOutputPair(input_data="c", expected_output="gamma")
+        ]
+        self.outputs = ["alpha", "bet", "gam"]
+
+    async def test_evaluate_outputs_runs_concurrently_in_order(self):
+        """Pairs should be evaluated concurrently, up to the cap, with results in pair order."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_evaluate(actual_output, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return EvaluationResult(score=len(actual_output) / 10, global_feedback=actual_output)
+
+        with patch.object(self.evaluator, 'evaluate_output', side_effect=fake_evaluate):
+            results = await self.evaluator.evaluate_outputs(self.outputs, self.pairs, max_concurrency=2)
+
+        self.assertEqual(peak, 2)
+        self.assertEqual([result.global_feedback for result in results], self.outputs)
+
+    async def test_precomputed_evaluations_are_not_re_evaluated(self):
+        """Passing individual evaluations should aggregate them without further LLM calls."""
+        with patch('agent_optimizer.llm_utils.call_evaluation_agent',
+                   new=AsyncMock(return_value=EVALUATION_RESPONSE)) as mock_call:
+            individual = await self.evaluator.evaluate_outputs(self.outputs, self.pairs)
+            aggregated = await self.evaluator.evaluate_multiple_outputs(
+                self.outputs, self.pairs, individual_evaluations=individual
+            )
+
+        self.assertEqual(mock_call.await_count, len(self.pairs))
+        self.assertAlmostEqual(aggregated.score, 0.6)
+
+
+class TestScoreAggregation(unittest.TestCase):
+    """Test cases for reducing per-pair scores with each strategy."""
+
+    def test_strategies(self):
+        """Each strategy should reduce the scores as documented, using pair weights where relevant."""
+        evaluator = OutputEvaluator()
+        pairs = [(0.2, 1.0), (0.9, 3.0), (0.4, 0.0), (0.5, 0.0)]
+        expected = {
+            AggregationStrategy.AVERAGE: 0.5,
+            AggregationStrategy.WEIGHTED_AVERAGE: 0.725,
+            AggregationStrategy.MIN: 0.2,
+            AggregationStrategy.MAX: 0.9,
+            AggregationStrategy.MEDIAN: 0.45
+        }
+        for strategy, score in expected.items():
+            self.assertAlmostEqual(evaluator._aggregate_scores(pairs, strategy), score, msg=strategy)
+
+        self.assertAlmostEqual(
+            evaluator._aggregate_scores([(0.2, 0.0), (0.6, 0.0)], AggregationStrategy.WEIGHTED_AVERAGE), 0.4
+        )
+        self.assertEqual(evaluator._aggregate_scores([], AggregationStrategy.MEDIAN), 0.0)
+
+
+class TestMetricAggregation(unittest.TestCase):
+    """Test cases for averaging metrics across evaluations."""
+
+    def test_missing_metrics_count_as_zero(self):
+        """Each metric is averaged over non-empty results, treating missing keys as 0.0."""
+        aggregated = OutputEvaluator()._aggregate_metrics([
+            {'bleu_score': 0.5, 'exact_match': 1.0},
+            {},
+            {'bleu_score': 0.3}
+        ])
+
+        self.assertAlmostEqual(aggregated['bleu_score'], 0.4)
+        self.assertAlmostEqual(aggregated['exact_match'], 0.5)
+        self.assertEqual(OutputEvaluator()._aggregate_metrics([{}, {}]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Unit tests for the pooled LiteLLM HTTP client in utils.http_pool.
+"""
+
+import asyncio
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add the project root to the path so we can import modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils import http_pool
+from utils.http_pool import configure_litellm_http_pool
+
+
+class TestLiteLLMHttpPool(unittest.TestCase):
+    """Test cases for installing one pooled client per event loop."""
+
+    def setUp(self):
+        """Install fake httpx/litellm modules and reset the module's pool state."""
+        self.httpx = MagicMock()
+        self.httpx.AsyncClient.side_effect = lambda **kwargs: object()
+        self.litellm = SimpleNamespace(aclient_session=None)
+        for patcher in (
+            patch.object(http_pool, 'HTTP_POOL_AVAILABLE', True),
+            patch.object(http_pool, 'httpx', self.httpx, create=True),
+            patch.object(http_pool, 'litellm', self.litellm, create=True),
+            patch.object(http_pool, '_pool_client', None),
+            patch.object(http_pool, '_pool_loop', None)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_one_client_per_event_loop(self):
+        """Calls on one loop share a client; a new loop gets a new client."""
+        async def configure_twice():
+            self.assertTrue(configure_litellm_http_pool())
+            first = self.litellm.aclient_session
+            self.assertTrue(configure_litellm_http_pool())
+            return first, self.litellm.aclient_session
+
+        first, second = asyncio.run(configure_twice())
+        self.assertIs(first, second)
+        self.assertEqual(self.httpx.AsyncClient.call_count, 1)
+
+        third, _ = asyncio.run(configure_twice())
+        self.assertIsNot(third, first)
+        self.assertEqual(self.httpx.AsyncClient.call_count, 2)
+
+    def test_caller_session_is_kept(self):
+        """A client set on litellm by the caller should never be replaced."""
+        caller_session = object()
+        self.litellm.aclient_session = caller_session
+
+        self.assertTrue(asyncio.run(self._configure()))
+        self.assertIs(self.litellm.aclient_session, caller_session)
+        self.httpx.AsyncClient.assert_not_called()
+
+    def test_nothing_installed_outside_event_loop(self):
+        """Without a running loop there is no loop to bind a client to."""
+        self.assertFalse(configure_litellm_http_pool())
+        self.assertIsNone(self.litellm.aclient_session)
+
+    def test_unavailable_without_dependencies(self):
+        """Missing httpx or litellm should leave LiteLLM untouched."""
+        with patch.object(http_pool, 'HTTP_POOL_AVAILABLE', False):
+            self.assertFalse(asyncio.run(self._configure()))
+        self.assertIsNone(self.litellm.aclient_session)
+
+    async def _configure(self):
+        return configure_litellm_http_pool()
+
+
+if __name__ == "__main__":
+    unittest.main()
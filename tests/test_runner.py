@@ -0,0 +1,174 @@
+"""
+Unit tests for configuration serialization, result caching and batch runs in agent_optimizer.runner.
+"""
+
+import asyncio
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import yaml
+
+# Add the project root to the path so we can import modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent_optimizer.runner import WorkflowRunner, _dump_config_yaml
+
+
+class TestConfigYamlDump(unittest.TestCase):
+    """Test cases for turning configurations into YAML for the workflow."""
+
+    def test_configs_round_trip_through_safe_load(self):
+        """Dumped configs should load back unchanged, including YAML-sensitive values."""
+        configs = [
+            {
+                'name': 'Root', 'instruction': 'Say "hi"\n\tthen stop', 'temperature': 0.7,
+                'sub_agents': [{'name': 'A', 'enabled': True, 'note': None, 'answer': 'yes'}]
+            },
+            {'threshold': 1e-20, 'instruction': 'raw x\x85y control'},
+            {1: 'int key', '1': 'str key'}
+        ]
+        for config in configs:
+            self.assertEqual(yaml.safe_load(_dump_config_yaml(config)), config, msg=config)
+
+    def test_cached_text_is_reused(self):
+        """Equal configs should be served the same cached YAML text."""
+        config = {'name': 'Root', 'instruction': 'root'}
+
+        self.assertIs(_dump_config_yaml(config), _dump_config_yaml(dict(config)))
+
+    def test_type_distinct_configs_do_not_share_cache_entries(self):
+        """Configs that differ only in value types should each get their own YAML."""
+        pairs = [
+            ({1: 'a'}, {'1': 'a'}),
+            ({'n': 1}, {'n': '1'}),
+            ({'n': 1}, {'n': True}),
+            ({'x': 0.0}, {'x': -0.0})
+        ]
+        # JSON fingerprints merged these pairs when orjson was missing
+        with patch('agent_optimizer.runner.ORJSON_AVAILABLE', False):
+            for first, second in pairs:
+                self.assertNotEqual(_dump_config_yaml(first), _dump_config_yaml(second), msg=second)
+
+
+WORKFLOW_RESULTS = {'execution_results': {'Root': 'Root %% (2024-01-01): hello'}}
+
+
+class TestWorkflowResultCache(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the opt-in workflow result cache."""
+
+    async def test_disabled_by_default(self):
+        """Without enable_result_cache every run should execute the workflow."""
+        runner = WorkflowRunner()
+        with patch('agent_optimizer.runner.main_async_with_config',
+                   new=AsyncMock(return_value=(0, WORKFLOW_RESULTS))) as mock_run:
+            await runner.run_workflow({'name': 'Root'}, "question")
+            await runner.run_workflow({'name': 'Root'}, "question")
+
+        self.assertEqual(mock_run.await_count, 2)
+
+    async def test_hit_returns_output_with_independent_trace(self):
+        """A cache hit should reuse the output but never hand out a shared trace."""
+        runner = WorkflowRunner(enable_result_cache=True)
+        with patch('agent_optimizer.runner.main_async_with_config',
+                   new=AsyncMock(return_value=(0, WORKFLOW_RESULTS))) as mock_run:
+            first_output, first_trace = await runner.run_workflow({'name': 'Root'}, "question")
+            first_trace.agent_traces['Root'].output_data = "edited by caller"
+            second_output, second_trace = await runner.run_workflow({'name': 'Root'}, "question")
+            third_output, third_trace = await runner.run_workflow({'name': 'Root'}, "question")
+
+        self.assertEqual(mock_run.await_count, 1)
+        self.assertEqual(second_output, first_output)
+        self.assertEqual(third_output, first_output)
+        self.assertIsNot(second_trace, first_trace)
+        self.assertIsNot(third_trace, second_trace)
+        self.assertEqual(second_trace.agent_traces['Root'].output_data, "hello")
+
+        second_trace.agent_traces['Root'].output_data = "edited again"
+        self.assertEqual(third_trace.agent_traces['Root'].output_data, "hello")
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        """The cache should hold at most result_cache_size runs, dropping the oldest."""
+        runner = WorkflowRunner(enable_result_cache=True, result_cache_size=2)
+        with patch('agent_optimizer.runner.main_async_with_config',
+                   new=AsyncMock(return_value=(0, WORKFLOW_RESULTS))) as mock_run:
+            await runner.run_workflow({'name': 'Root'}, "a")
+            await runner.run_workflow({'name': 'Root'}, "b")
+            await runner.run_workflow({'name': 'Root'}, "a")  # hit; "b" is now oldest
+            await runner.run_workflow({'name': 'Root'}, "c")  # evicts "b"
+            self.assertEqual(mock_run.await_count, 3)
+
+            await runner.run_workflow({'name': 'Root'}, "a")
+            self.assertEqual(mock_run.await_count, 3)
+            await runner.run_workflow({'name': 'Root'}, "b")
+            self.assertEqual(mock_run.await_count, 4)
+
+    async def test_failed_runs_are_not_cached(self):
+        """Runs with a non-zero exit code should execute again next time."""
+        runner = WorkflowRunner(enable_result_cache=True)
+        with patch('agent_optimizer.runner.main_async_with_config',
+                   new=AsyncMock(return_value=(1, {'error_message': 'boom'}))) as mock_run:
+            await runner.run_workflow({'name': 'Root'}, "question")
+            await runner.run_workflow({'name': 'Root'}, "question")
+
+        self.assertEqual(mock_run.await_count, 2)
+
+
+class TestWorkflowTraceAccess(unittest.IsolatedAsyncioTestCase):
+    """Test cases for reading a run's trace from the runner."""
+
+    async def test_last_trace_outlives_the_run(self):
+        """last_trace should keep the finished run's trace while current_trace resets."""
+        runner = WorkflowRunner()
+        with patch('agent_optimizer.runner.main_async_with_config',
+                   new=AsyncMock(return_value=(0, WORKFLOW_RESULTS))):
+            _, trace = await runner.run_workflow({'name': 'Root'}, "question")
+
+        self.assertIs(runner.last_trace, trace)
+        self.assertIsNone(runner.current_trace)
+
+
+class TestWorkflowBatch(unittest.IsolatedAsyncioTestCase):
+    """Test cases for running several workflows concurrently."""
+
+    async def test_concurrency_is_bounded(self):
+        """No more than `concurrency` workflows should run at the same time."""
+        running = 0
+        peak = 0
+
+        async def fake_run(self, agent_config, input_data, *args):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return f"out-{input_data}", None
+
+        items = [{'agent_config': {'name': 'Root'}, 'input_data': i} for i in range(7)]
+        with patch.object(WorkflowRunner, '_run_workflow', new=fake_run):
+            results = await WorkflowRunner().run_workflows_batch(items, concurrency=3)
+
+        self.assertEqual(peak, 3)
+        self.assertEqual([output for output, _ in results], [f"out-{i}" for i in range(7)])
+
+    async def test_exceptions_become_error_results(self):
+        """A failing workflow should yield (message, None) without failing the batch."""
+        async def fake_run(self, agent_config, input_data, *args):
+            if input_data == "bad":
+                raise RuntimeError("boom")
+            return "ok", None
+
+        items = [
+            {'agent_config': {'name': 'Root'}, 'input_data': "good"},
+            {'agent_config': {'name': 'Root'}, 'input_data': "bad"}
+        ]
+        with patch.object(WorkflowRunner, '_run_workflow', new=fake_run):
+            results = await WorkflowRunner().run_workflows_batch(items)
+
+        self.assertEqual(results, [("ok", None), ("Error executing workflow: boom", None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,503 @@
+"""
+Unit tests for the SuggestionGenerator in agent_optimizer.suggester.
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# Add the project root to the path so we can import modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent_optimizer.semantic_cache import SemanticResponseCache
+from agent_optimizer.suggester import (
+    SuggestionGenerator, TIKTOKEN_AVAILABLE, _PROMPT_CONTEXT_MAX_TOKENS, _extract_json,
+    _get_encoding, _render_prompts_context, _truncate_prompt
+)
+from agent_optimizer.types import AgentFeedback, EvaluationResult, InputOutputPair, OptimizationObjective, LLMServiceError
+
+
+SUGGESTION_RESPONSE = '''Here are my suggestions:
+[
+    {
+        "agent_id": "GeneralCodeAnalysisAgent",
+        "new_prompt": "Analyze the code and document every function.",
+        "reason": "Missing function documentation",
+        "confidence": 0.9
+    }
+]'''
+
+
+class TestSuggestionLLMCache(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the prompt-level LLM response cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.current_prompts = {'GeneralCodeAnalysisAgent': 'Analyze the code.'}
+        self.evaluation = EvaluationResult(score=0.5, global_feedback="Needs more detail")
+
+    async def _generate(self, generator):
+        return await generator.generate_suggestions(
+            current_prompts=self.current_prompts,
+            evaluation_result=self.evaluation,
+            objective=OptimizationObjective.ACCURACY
+        )
+
+    async def test_repeated_prompt_hits_cache(self):
+        """Identical requests should only reach the LLM once when caching is enabled."""
+        generator = SuggestionGenerator(enable_llm_cache=True)
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent',
+                   new=AsyncMock(return_value=SUGGESTION_RESPONSE)) as mock_call:
+            first = await self._generate(generator)
+            second = await self._generate(generator)
+
+        self.assertEqual(mock_call.await_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first[0].agent_id, 'GeneralCodeAnalysisAgent')
+
+    async def test_cache_disabled_by_default(self):
+        """Without opting in, every request should call the LLM."""
+        generator = SuggestionGenerator()
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent',
+                   new=AsyncMock(return_value=SUGGESTION_RESPONSE)) as mock_call:
+            await self._generate(generator)
+            await self._generate(generator)
+
+        self.assertEqual(mock_call.await_count, 2)
+
+    async def test_unparseable_response_not_cached(self):
+        """Responses that fail to parse must not be served from the cache on retry."""
+        generator = SuggestionGenerator(enable_llm_cache=True)
+        full_prompt = "prompt"
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent',
+                   new=AsyncMock(side_effect=["no json here", SUGGESTION_RESPONSE])) as mock_call:
+            with self.assertRaises(LLMServiceError):
+                await generator._real_llm_suggestions(
+                    full_prompt, self.current_prompts, self.evaluation, OptimizationObjective.ACCURACY
+                )
+            suggestions = await generator._real_llm_suggestions(
+                full_prompt, self.current_prompts, self.evaluation, OptimizationObjective.ACCURACY
+            )
+
+        self.assertEqual(mock_call.await_count, 2)
+        self.assertEqual(len(suggestions), 1)
+
+
+class TestJSONExtraction(unittest.TestCase):
+    """Test cases for extracting JSON blocks from LLM responses."""
+
+    def test_ignores_trailing_prose_and_second_block(self):
+        """Only the first balanced block should be extracted."""
+        text = 'Result: [{"a": 1}] and also [2] (see notes]'
+        self.assertEqual(_extract_json(text, '['), '[{"a": 1}]')
+
+    def test_skips_brackets_inside_strings(self):
+        """Brackets and escaped quotes inside strings must not affect depth."""
+        text = 'x {"reason": "use } and \\" {", "n": [1]} trailing }'
+        self.assertEqual(_extract_json(text, '{'), '{"reason": "use } and \\" {", "n": [1]}')
+
+    def test_escaped_backslash_before_closing_quote(self):
+        """An escaped backslash must not escape the quote that follows it."""
+        text = '[{"path": "C:\\\\"}, "]"] tail]'
+        self.assertEqual(_extract_json(text, '['), '[{"path": "C:\\\\"}, "]"]')
+
+    def test_unbalanced_returns_none(self):
+        """Truncated or missing JSON yields None."""
+        self.assertIsNone(_extract_json('no json here', '['))
+        self.assertIsNone(_extract_json('[{"a": 1}', '['))
+
+    def test_parse_llm_response_with_trailing_braces(self):
+        """Suggestions followed by prose containing brackets should still parse."""
+        generator = SuggestionGenerator()
+        suggestions = generator._parse_llm_response(SUGGESTION_RESPONSE + "\nNote: [optional] tweaks {later}.")
+        self.assertEqual(len(suggestions), 1)
+
+
+class TestAggregatedFeedbackParsing(unittest.TestCase):
+    """Test cases for parsing the aggregation LLM response."""
+
+    def test_agent_feedback_entries_become_objects(self):
+        """Dict entries are converted with defaults and non-object entries are dropped."""
+        response = '''{"global_feedback": "g", "agent_feedback": [
+            {"agent_id": "A", "issue": "i"}, "stray text", {"agent_id": "B", "issue": "j", "evidence": "e"}
+        ]}'''
+        parsed = SuggestionGenerator()._parse_aggregated_feedback(response)
+
+        self.assertEqual(
+            parsed['agent_feedback'],
+            [AgentFeedback("A", "i", ""), AgentFeedback("B", "j", "e")]
+        )
+
+
+class TestPromptsContext(unittest.TestCase):
+    """Test cases for the shared current-prompts context."""
+
+    def test_render_is_truncated_and_stable(self):
+        """Equal prompt dicts should render to the same truncated context."""
+        prompts = {'AgentA': 'x' * 500, 'AgentB': 'short'}
+        with patch('agent_optimizer.suggester._get_encoding', return_value=None):
+            context = _render_prompts_context(prompts, "char-fallback-model")
+            self.assertEqual(context, _render_prompts_context(dict(prompts), "char-fallback-model"))
+
+        self.assertEqual(context, f"Agent 'AgentA': {'x' * 300}...\nAgent 'AgentB': short...")
+
+    def test_truncation_uses_token_boundaries(self):
+        """With an encoding available, prompts are cut to the token budget."""
+        class WordEncoding:
+            def encode(self, text, disallowed_special=()):
+                return text.split(' ')
+
+            def decode(self, tokens):
+                return ' '.join(tokens)
+
+        prompts = {'AgentA': 'one two three four five', 'AgentB': 'one two'}
+        with patch('agent_optimizer.suggester._get_encoding', return_value=WordEncoding()):
+            context = _render_prompts_context(prompts, "word-model", max_tokens=3)
+
+        self.assertEqual(context, "Agent 'AgentA': one two three...\nAgent 'AgentB': one two...")
+
+    def test_default_budget_is_counted_in_tokens(self):
+        """Without an explicit budget, prompts are cut to _PROMPT_CONTEXT_MAX_TOKENS tokens."""
+        class WordEncoding:
+            def encode(self, text, disallowed_special=()):
+                return text.split(' ')
+
+            def decode(self, tokens):
+                return ' '.join(tokens)
+
+        words = [f"w{i}" for i in range(_PROMPT_CONTEXT_MAX_TOKENS + 25)]
+        with patch('agent_optimizer.suggester._get_encoding', return_value=WordEncoding()):
+            context = _render_prompts_context({'AgentA': ' '.join(words)}, "word-model-default")
+
+        expected = ' '.join(words[:_PROMPT_CONTEXT_MAX_TOKENS])
+        self.assertEqual(context, f"Agent 'AgentA': {expected}...")
+
+    @unittest.skipUnless(TIKTOKEN_AVAILABLE, "tiktoken not installed")
+    def test_tiktoken_truncation_is_a_token_bounded_prefix(self):
+        """With tiktoken, long prompts become a prefix of at most the token budget."""
+        prompt = "Review the draft carefully and report every factual error. " * 40
+        excerpt = _truncate_prompt(prompt, _PROMPT_CONTEXT_MAX_TOKENS, "gpt-4o")
+        encoding = _get_encoding("gpt-4o")
+
+        self.assertTrue(prompt.startswith(excerpt))
+        self.assertLess(len(excerpt), len(prompt))
+        self.assertLessEqual(len(encoding.encode(excerpt)), _PROMPT_CONTEXT_MAX_TOKENS)
+
+
+class TestStreamingSuggestions(unittest.IsolatedAsyncioTestCase):
+    """Test cases for streaming suggestions as they are generated."""
+
+    async def test_yields_each_suggestion_as_it_completes(self):
+        """Suggestions split across chunks should be yielded once complete, skipping bad ones."""
+        chunks = [
+            'Sure: [{"agent_id": "A", "new_prompt": "use [x], {y}", ',
+            '"reason": "r", "confidence": 0.9}, {"agent_id": "B"}, ',
+            '{"agent_id": "C", "new_prompt": "p", "reason": "r"}] trailing',
+        ]
+        received = []
+
+        async def fake_stream(**kwargs):
+            for chunk in chunks:
+                received.append(chunk)
+                yield chunk
+
+        generator = SuggestionGenerator()
+        evaluation = EvaluationResult(score=0.5, global_feedback="Needs more detail")
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent_stream', new=fake_stream):
+            stream = generator.stream_suggestions({'A': 'prompt'}, evaluation)
+            first = await stream.__anext__()
+            self.assertEqual(len(received), 2)
+            rest = [suggestion async for suggestion in stream]
+
+        self.assertEqual(first.new_prompt, "use [x], {y}")
+        self.assertEqual([suggestion.agent_id for suggestion in rest], ['C'])
+        self.assertEqual(rest[0].confidence, 0.7)
+
+    async def test_stream_failure_raises_and_early_stop_closes(self):
+        """A failed call raises a service error; stopping after the array closes the stream."""
+        closed = []
+
+        async def complete_stream(**kwargs):
+            try:
+                yield '[{"agent_id": "A", "new_prompt": "p", "reason": "r"}]'
+                yield ' unread tail'
+            finally:
+                closed.append(True)
+
+        async def failing_stream(**kwargs):
+            yield '[{"agent_id": "A", '
+            raise ConnectionError("connection reset")
+
+        generator = SuggestionGenerator()
+        evaluation = EvaluationResult(score=0.5, global_feedback="Needs more detail")
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent_stream', new=complete_stream):
+            suggestions = [suggestion async for suggestion in generator.stream_suggestions({'A': 'p'}, evaluation)]
+        self.assertEqual(len(suggestions), 1)
+        self.assertEqual(closed, [True])
+
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent_stream', new=failing_stream):
+            with self.assertRaises(LLMServiceError) as raised:
+                async for _ in generator.stream_suggestions({'A': 'p'}, evaluation):
+                    pass
+        self.assertEqual(raised.exception.error_type, "service_error")
+
+    async def test_real_llm_suggestions_parse_while_streaming(self):
+        """With streaming enabled, suggestions are parsed from the stream without a blocking call."""
+        chunks = ['Here you go: [{"agent_id": "A", "new_prompt": "p", ', '"reason": "r"}]', ' unread tail']
+        received = []
+
+        async def fake_stream(**kwargs):
+            for chunk in chunks:
+                received.append(chunk)
+                yield chunk
+
+        generator = SuggestionGenerator(stream_llm_responses=True)
+        evaluation = EvaluationResult(score=0.5, global_feedback="Needs more detail")
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent_stream', new=fake_stream), \
+             patch('agent_optimizer.llm_utils.call_suggestion_agent', new=AsyncMock()) as mock_call:
+            suggestions = await generator._real_llm_suggestions(
+                "prompt", {'A': 'prompt'}, evaluation, OptimizationObjective.ACCURACY
+            )
+
+        mock_call.assert_not_awaited()
+        self.assertEqual(len(received), 2)
+        self.assertEqual(suggestions, [{'agent_id': 'A', 'new_prompt': 'p', 'reason': 'r', 'confidence': 0.7}])
+
+    async def test_stream_is_closed_after_early_stop(self):
+        """Stopping at the end of the array should close the stream instead of leaving it to GC."""
+        closed = []
+
+        async def fake_stream(**kwargs):
+            try:
+                yield '[{"agent_id": "A", "new_prompt": "p", "reason": "r"}]'
+                yield ' unread tail'
+            finally:
+                closed.append(True)
+
+        generator = SuggestionGenerator(stream_llm_responses=True)
+        evaluation = EvaluationResult(score=0.5, global_feedback="Needs more detail")
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent_stream', new=fake_stream):
+            await generator._real_llm_suggestions("prompt", {'A': 'prompt'}, evaluation, OptimizationObjective.ACCURACY)
+
+        self.assertEqual(closed, [True])
+
+    async def test_stream_failure_is_a_service_error(self):
+        """A provider error partway through the stream should surface as a service error."""
+        async def failing_stream(**kwargs):
+            yield '[{"agent_id": "A", '
+            raise ConnectionError("connection reset")
+
+        generator = SuggestionGenerator(stream_llm_responses=True)
+        evaluation = EvaluationResult(score=0.5, global_feedback="Needs more detail")
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent_stream', new=failing_stream):
+            with self.assertRaises(LLMServiceError) as raised:
+                await generator._real_llm_suggestions(
+                    "prompt", {'A': 'prompt'}, evaluation, OptimizationObjective.ACCURACY
+                )
+
+        self.assertEqual(raised.exception.error_type, "service_error")
+
+
+class TestBatchedAggregationSuggestions(unittest.IsolatedAsyncioTestCase):
+    """Test cases for returning suggestions from the multi-pair aggregation call."""
+
+    AGGREGATION_RESPONSE = '''{
+        "global_feedback": "Outputs lack detail",
+        "agent_feedback": [],
+        "suggestions": [
+            {
+                "agent_id": "GeneralCodeAnalysisAgent",
+                "new_prompt": "Analyze the code in detail.",
+                "reason": "Outputs lack detail",
+                "confidence": 0.8
+            }
+        ]
+    }'''
+
+    async def _generate(self, generator, aggregation_response):
+        pairs = [
+            InputOutputPair(input_data="a", expected_output="A"),
+            InputOutputPair(input_data="b", expected_output="B")
+        ]
+        evaluations = [EvaluationResult(score=0.4, global_feedback="Too short")] * 2
+        with patch('agent_optimizer.llm_utils.call_evaluation_agent',
+                   new=AsyncMock(return_value=aggregation_response)) as mock_aggregate, \
+             patch('agent_optimizer.llm_utils.call_suggestion_agent',
+                   new=AsyncMock(return_value=SUGGESTION_RESPONSE)) as mock_suggest:
+            suggestions = await generator.generate_suggestions_for_multiple_pairs(
+                current_prompts={'GeneralCodeAnalysisAgent': 'Analyze the code.'},
+                individual_evaluations=evaluations,
+                input_output_pairs=pairs,
+                aggregated_evaluation=evaluations[0]
+            )
+        return suggestions, mock_aggregate, mock_suggest
+
+    async def test_batched_suggestions_skip_second_call(self):
+        """Suggestions in the aggregation response should replace the suggestion call."""
+        generator = SuggestionGenerator(batch_aggregation_suggestions=True)
+        suggestions, mock_aggregate, mock_suggest = await self._generate(generator, self.AGGREGATION_RESPONSE)
+
+        self.assertEqual(mock_aggregate.await_count, 1)
+        self.assertEqual(mock_suggest.await_count, 0)
+        self.assertIn("suggestions", mock_aggregate.await_args.kwargs['evaluation_prompt'])
+        self.assertEqual(suggestions[0].new_prompt, "Analyze the code in detail.")
+
+    async def test_missing_suggestions_fall_back(self):
+        """Without suggestions in the aggregation response, the suggestion call still runs."""
+        generator = SuggestionGenerator(batch_aggregation_suggestions=True)
+        response = '{"global_feedback": "Outputs lack detail", "agent_feedback": []}'
+        suggestions, _, mock_suggest = await self._generate(generator, response)
+
+        self.assertEqual(mock_suggest.await_count, 1)
+        self.assertEqual(suggestions[0].new_prompt, "Analyze the code and document every function.")
+
+    async def test_unrequested_suggestions_are_ignored(self):
+        """Without batch_aggregation_suggestions, stray suggestions in the response are not used."""
+        generator = SuggestionGenerator(batch_aggregation_suggestions=False)
+        suggestions, mock_aggregate, mock_suggest = await self._generate(generator, self.AGGREGATION_RESPONSE)
+
+        self.assertNotIn("suggestions", mock_aggregate.await_args.kwargs['evaluation_prompt'])
+        self.assertEqual(mock_suggest.await_count, 1)
+        self.assertEqual(suggestions[0].new_prompt, "Analyze the code and document every function.")
+
+
+class TestNoChangeThreshold(unittest.IsolatedAsyncioTestCase):
+    """Test cases for skipping the LLM when evaluations are already good enough."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.current_prompts = {'GeneralCodeAnalysisAgent': 'Analyze the code.'}
+        self.pairs = [
+            InputOutputPair(input_data="a", expected_output="A"),
+            InputOutputPair(input_data="b", expected_output="B")
+        ]
+
+    async def _generate_for_pairs(self, generator, aggregated_score):
+        evaluations = [EvaluationResult(score=score, global_feedback="ok") for score in (0.99, 0.4)]
+        aggregated = EvaluationResult(score=0.7, global_feedback="Aggregated feedback")
+        with patch.object(generator, '_aggregate_feedback_across_pairs',
+                          new=AsyncMock(return_value=(aggregated, []))) as mock_aggregate, \
+             patch('agent_optimizer.llm_utils.call_suggestion_agent',
+                   new=AsyncMock(return_value=SUGGESTION_RESPONSE)) as mock_suggest:
+            suggestions = await generator.generate_suggestions_for_multiple_pairs(
+                current_prompts=self.current_prompts,
+                individual_evaluations=evaluations,
+                input_output_pairs=self.pairs,
+                aggregated_evaluation=EvaluationResult(score=aggregated_score, global_feedback="ok")
+            )
+        return suggestions, mock_aggregate, mock_suggest
+
+    async def test_high_score_skips_llm(self):
+        """High scores without agent feedback should return no suggestions and no LLM call."""
+        evaluation = EvaluationResult(score=0.97, global_feedback="Great")
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent', new=AsyncMock()) as mock_call:
+            suggestions = await SuggestionGenerator(no_change_threshold=0.95).generate_suggestions(
+                self.current_prompts, evaluation
+            )
+
+        self.assertEqual(suggestions, [])
+        mock_call.assert_not_awaited()
+
+    async def test_agent_feedback_or_default_threshold_still_calls_llm(self):
+        """Agent-specific feedback, or the default (disabled) threshold, should keep the LLM call."""
+        with_feedback = EvaluationResult(
+            score=0.97, global_feedback="Great",
+            agent_feedback=[AgentFeedback('GeneralCodeAnalysisAgent', 'Too verbose', 'Long output')]
+        )
+        without_feedback = EvaluationResult(score=0.97, global_feedback="Great")
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent',
+                   new=AsyncMock(return_value=SUGGESTION_RESPONSE)) as mock_call:
+            await SuggestionGenerator(no_change_threshold=0.95).generate_suggestions(
+                self.current_prompts, with_feedback
+            )
+            await SuggestionGenerator().generate_suggestions(self.current_prompts, without_feedback)
+
+        self.assertEqual(mock_call.await_count, 2)
+
+    async def test_threshold_applies_to_aggregated_evaluation(self):
+        """A satisfied aggregate skips all calls; otherwise every pair is still aggregated."""
+        generator = SuggestionGenerator(no_change_threshold=0.95)
+        suggestions, mock_aggregate, mock_suggest = await self._generate_for_pairs(generator, 0.96)
+        self.assertEqual(suggestions, [])
+        mock_aggregate.assert_not_awaited()
+        mock_suggest.assert_not_awaited()
+
+        suggestions, mock_aggregate, mock_suggest = await self._generate_for_pairs(generator, 0.7)
+        self.assertEqual(len(mock_aggregate.await_args.args[0]), 2)
+        self.assertEqual(mock_suggest.await_count, 1)
+        self.assertEqual(len(suggestions), 1)
+
+
+class TestSemanticResponseCache(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the embedding-based semantic response cache."""
+
+    @staticmethod
+    async def _embed(text):
+        # Toy embedding: counts of a few marker words
+        words = text.lower().split()
+        return [words.count('code'), words.count('detail'), words.count('poem') + 0.01]
+
+    async def test_near_duplicate_prompt_hits(self):
+        """A similar prompt with the same system message should reuse the response."""
+        cache = SemanticResponseCache(embed_fn=self._embed, threshold=0.95)
+        embedding = await cache.embed("review the code in detail")
+        cache.store("system", embedding, "cached response")
+
+        similar = await cache.embed("please review this code in more detail")
+        self.assertEqual(cache.lookup("system", similar), "cached response")
+
+    async def test_dissimilar_or_other_system_message_misses(self):
+        """Different prompts or system messages should not hit the cache."""
+        cache = SemanticResponseCache(embed_fn=self._embed, threshold=0.95)
+        embedding = await cache.embed("review the code in detail")
+        cache.store("system", embedding, "cached response")
+
+        self.assertIsNone(cache.lookup("other system", embedding))
+        different = await cache.embed("write a poem")
+        self.assertIsNone(cache.lookup("system", different))
+
+    async def test_persisted_entries_survive_restart(self):
+        """Entries stored with persist_path should be available to a new cache instance."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'semantic_cache.json')
+            cache = SemanticResponseCache(embed_fn=self._embed, persist_path=path)
+            cache.store("system", await cache.embed("review the code in detail"), "cached response")
+            await cache.aflush()
+
+            reloaded = SemanticResponseCache(embed_fn=self._embed, persist_path=path)
+            similar = await reloaded.embed("please review this code in more detail")
+            self.assertEqual(reloaded.lookup("system", similar), "cached response")
+
+    async def test_corrupt_or_malformed_persisted_entries_are_skipped(self):
+        """A truncated file should start empty and malformed entries should be dropped."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'semantic_cache.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('[["system", [1.0, 0.0], "resp')
+            self.assertEqual(len(SemanticResponseCache(embed_fn=self._embed, persist_path=path)._entries), 0)
+
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('[["system", [1.0, 0.0], "ok"], ["system", "not a vector", "bad"], ["short"], 7]')
+            cache = SemanticResponseCache(embed_fn=self._embed, persist_path=path)
+            self.assertEqual(list(cache._entries.values()), [("system", [1.0, 0.0], "ok")])
+
+    async def test_suggester_uses_semantic_cache(self):
+        """The suggester should skip the LLM call on a semantic cache hit."""
+        cache = SemanticResponseCache(embed_fn=AsyncMock(return_value=[1.0, 0.0]))
+        generator = SuggestionGenerator(semantic_cache=cache)
+        evaluation = EvaluationResult(score=0.5, global_feedback="Needs more detail")
+        with patch('agent_optimizer.llm_utils.call_suggestion_agent',
+                   new=AsyncMock(return_value=SUGGESTION_RESPONSE)) as mock_call:
+            await generator._real_llm_suggestions("prompt one", {}, evaluation, OptimizationObjective.ACCURACY)
+            suggestions = await generator._real_llm_suggestions("prompt two", {}, evaluation, OptimizationObjective.ACCURACY)
+
+        self.assertEqual(mock_call.await_count, 1)
+        self.assertEqual(suggestions[0]['agent_id'], 'GeneralCodeAnalysisAgent')
+
+
+if __name__ == "__main__":
+    unittest.main()
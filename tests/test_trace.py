@@ -0,0 +1,116 @@
+"""
+Unit tests for the TraceExtractor in agent_optimizer.trace.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add the project root to the path so we can import modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent_optimizer.trace import TraceExtractor, HYPERSCAN_AVAILABLE
+
+
+class TestAgentTraceExtraction(unittest.TestCase):
+    """Test cases for building agent traces from responses."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.extractor = TraceExtractor()
+
+    def test_errors_and_tools_are_extracted(self):
+        """The content, first error message and all tool mentions should be captured."""
+        response = (
+            "ReviewAgent %% (2023-01-01T12:00:00): Reviewed the code\n"
+            "Using tool: search\n"
+            "ERROR: timeout while fetching\n"
+            "API call: github"
+        )
+        trace = self.extractor._create_agent_trace("ReviewAgent", response, "Review the code.")
+
+        self.assertTrue(trace.output_data.startswith("Reviewed the code"))
+        self.assertEqual(trace.error, "timeout while fetching")
+        self.assertEqual(trace.tools_used, ["search", "github"])
+        self.assertEqual(trace.prompt, "Review the code.")
+
+    def test_single_scan_matches_per_pattern_search(self):
+        """Error priority and per-pattern tool grouping should match separate searches."""
+        response = (
+            "Exception: first in text\n"
+            "Function: parse\n"
+            "Using tool: a\n"
+            "Error: higher priority\n"
+            "Function: Using tool: nested"
+        )
+        error, tools = self.extractor._scan_response_markers(response)
+
+        self.assertEqual(error, "higher priority")
+        self.assertEqual(tools, ["a", "nested", "parse", "Using tool: nested"])
+
+    @unittest.skipUnless(HYPERSCAN_AVAILABLE, "hyperscan is not installed")
+    def test_hyperscan_matches_regex_scan(self):
+        """The Hyperscan path should report the same markers as the regex fallback."""
+        response = (
+            "Exception: first in text\n"
+            "error code: 500\n"
+            "Function: Using tool: nested\n"
+            "tool called: fetch é"
+        )
+        regex_extractor = TraceExtractor(use_hyperscan=False)
+
+        self.assertEqual(
+            self.extractor._scan_response_markers(response),
+            regex_extractor._scan_response_markers(response)
+        )
+
+    def test_clean_response_has_no_error_or_tools(self):
+        """Responses without markers should produce an empty error and tool list."""
+        trace = self.extractor._create_agent_trace("ReviewAgent", "All good", "")
+
+        self.assertIsNone(trace.error)
+        self.assertEqual(trace.tools_used, [])
+        self.assertEqual(trace.output_data, "All good")
+
+
+class TestWorkflowTraceExtraction(unittest.TestCase):
+    """Test cases for extracting a full workflow trace."""
+
+    def test_agent_traces_follow_execution_order(self):
+        """Each agent's trace should be built in execution order with its configured prompt."""
+        results = {
+            'execution_results': {
+                f'Agent{i}': f"Agent{i} %% (2023-01-01T12:00:00): output {i}\nUsing tool: t{i}"
+                for i in range(6)
+            }
+        }
+        config = {'name': 'Agent0', 'instruction': 'first'}
+
+        trace = TraceExtractor().extract_trace_from_results(results, config)
+
+        self.assertEqual(list(trace.agent_traces), [f'Agent{i}' for i in range(6)])
+        self.assertEqual(trace.agent_traces['Agent3'].tools_used, ['t3'])
+        self.assertEqual(trace.agent_traces['Agent0'].prompt, 'first')
+
+
+class TestAgentPromptExtraction(unittest.TestCase):
+    """Test cases for collecting prompts from nested agent configurations."""
+
+    def test_prompts_collected_in_declaration_order(self):
+        """Nested agents should be visited depth-first in declaration order."""
+        config = {
+            'name': 'Root', 'instruction': 'root',
+            'sub_agents': [
+                {'name': 'A', 'instruction': 'a', 'sub_agents': [{'name': 'A1', 'instruction': 'a1'}]},
+                {'name': 'NoPrompt'},
+                {'name': 'B', 'instruction': 'b'}
+            ]
+        }
+        prompts = TraceExtractor()._extract_agent_prompts(config)
+
+        self.assertEqual(list(prompts.items()), [('Root', 'root'), ('A', 'a'), ('A1', 'a1'), ('B', 'b')])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Unit tests for prompt updates in agent_optimizer.updater and agent_optimizer.types.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add the project root to the path so we can import modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent_optimizer.types import AgentConfigUpdater, PromptSuggestion
+from agent_optimizer.updater import PromptUpdater
+
+
+def make_config():
+    """Build a small nested workflow configuration."""
+    return {
+        'name': 'Root', 'class': 'SequentialAgent', 'module': 'core', 'instruction': 'root',
+        'sub_agents': [
+            {'name': 'A', 'class': 'LlmAgent', 'module': 'core', 'instruction': 'a',
+             'sub_agents': [{'name': 'A1', 'class': 'LlmAgent', 'module': 'core', 'instruction': 'a1'}]},
+            {'name': 'B', 'class': 'LlmAgent', 'module': 'core', 'instruction': 'b', 'tools': ['search']}
+        ]
+    }
+
+
+class TestAgentConfigUpdater(unittest.TestCase):
+    """Test cases for updating a single agent prompt."""
+
+    def test_update_copies_only_the_changed_path(self):
+        """The target agent changes in the result while the input and other subtrees are shared."""
+        config = make_config()
+        updated = AgentConfigUpdater.update_agent_prompt(config, 'A1', 'new a1')
+
+        self.assertEqual(updated['sub_agents'][0]['sub_agents'][0]['instruction'], 'new a1')
+        self.assertEqual(config['sub_agents'][0]['sub_agents'][0]['instruction'], 'a1')
+        self.assertEqual(config, make_config())
+        self.assertIsNot(updated['sub_agents'][0], config['sub_agents'][0])
+        self.assertIs(updated['sub_agents'][1], config['sub_agents'][1])
+
+    def test_first_match_in_declaration_order_is_updated(self):
+        """With duplicate names, the first agent in depth-first order should be updated."""
+        config = make_config()
+        config['sub_agents'][1]['name'] = 'A1'
+        updated = AgentConfigUpdater.update_agent_prompt(config, 'A1', 'new a1')
+
+        self.assertEqual(updated['sub_agents'][0]['sub_agents'][0]['instruction'], 'new a1')
+        self.assertEqual(updated['sub_agents'][1]['instruction'], 'b')
+
+    def test_unknown_agent_leaves_config_unchanged(self):
+        """Updating a missing agent should return an equal configuration."""
+        config = make_config()
+        self.assertEqual(AgentConfigUpdater.update_agent_prompt(config, 'Missing', 'x'), make_config())
+
+    def test_update_and_get_old_reports_replaced_prompt(self):
+        """The replaced prompt and whether the agent exists come back from one call."""
+        config = make_config()
+        updated, old_prompt, found = AgentConfigUpdater.update_and_get_old(config, 'A', 'new a')
+
+        self.assertEqual((old_prompt, found), ('a', True))
+        self.assertEqual(updated['sub_agents'][0]['instruction'], 'new a')
+        self.assertEqual(AgentConfigUpdater.update_and_get_old(config, 'Missing', 'x'), (config, "", False))
+
+    def test_name_index_paths_survive_updates(self):
+        """Index paths built once should keep pointing at the same agents after updates."""
+        config = make_config()
+        index = AgentConfigUpdater.build_name_index(config)
+        self.assertEqual(index, {'Root': (), 'A': (0,), 'A1': (0, 0), 'B': (1,)})
+
+        updated, old_prompt = AgentConfigUpdater.apply_prompt_at_path(config, index['A'], 'new a')
+        updated, old_prompt = AgentConfigUpdater.apply_prompt_at_path(updated, index['A1'], 'new a1')
+
+        self.assertEqual(old_prompt, 'a1')
+        self.assertEqual(AgentConfigUpdater.extract_agent_prompts(updated),
+                         {'Root': 'root', 'A': 'new a', 'A1': 'new a1', 'B': 'b'})
+        self.assertEqual(config, make_config())
+
+
+class TestPromptUpdater(unittest.TestCase):
+    """Test cases for applying suggestion batches."""
+
+    def test_apply_suggestions_records_changes(self):
+        """Changed prompts are applied; unknown or unchanged agents are skipped."""
+        config = make_config()
+        suggestions = [
+            PromptSuggestion(agent_id='B', new_prompt='better b', reason='r', confidence=0.9),
+            PromptSuggestion(agent_id='A', new_prompt='a', reason='same', confidence=0.8),
+            PromptSuggestion(agent_id='Missing', new_prompt='x', reason='r', confidence=0.7)
+        ]
+        updater = PromptUpdater(keep_full_prompts=True)
+        updated, applied = updater.apply_suggestions(config, suggestions)
+
+        self.assertEqual([suggestion.agent_id for suggestion in applied], ['B'])
+        self.assertEqual(updated['sub_agents'][1]['instruction'], 'better b')
+        self.assertEqual(config, make_config())
+        self.assertEqual(updater.update_history[-1]['changes'][0]['old_prompt'], 'b')
+
+    def test_suggestion_stream_is_read_only_up_to_limit(self):
+        """A generator of suggestions should be consumed only up to max_suggestions."""
+        pulled = []
+
+        def suggestion_stream():
+            for agent_id in ['A', 'B', 'A1']:
+                pulled.append(agent_id)
+                yield PromptSuggestion(agent_id=agent_id, new_prompt='new', reason='r', confidence=0.9)
+
+        updater = PromptUpdater()
+        updated, applied = updater.apply_suggestions(make_config(), suggestion_stream(), max_suggestions=2)
+
+        self.assertEqual(pulled, ['A', 'B'])
+        self.assertEqual([suggestion.agent_id for suggestion in applied], ['A', 'B'])
+        self.assertEqual(updater.update_history[-1]['total_suggestions'], 2)
+
+    def test_history_is_compact_and_bounded(self):
+        """By default history keeps prompt lengths and digests, for a bounded number of calls."""
+        updater = PromptUpdater(max_history=2)
+        for i in range(3):
+            suggestion = PromptSuggestion(agent_id='B', new_prompt=f'b{i}', reason='r', confidence=0.9)
+            updater.apply_suggestions(make_config(), [suggestion])
+
+        self.assertEqual(len(updater.update_history), 2)
+        change = updater.update_history[-1]['changes'][0]
+        self.assertNotIn('new_prompt', change)
+        self.assertEqual((change['old_len'], change['new_len']), (1, 2))
+        self.assertEqual(change['new_hash'], PromptUpdater._prompt_digest('b2'))
+
+    def test_batch_applies_latest_suggestion_per_agent(self):
+        """The last suggestion per agent wins; superseded ones are still reported and recorded."""
+        config = make_config()
+        suggestions = [
+            PromptSuggestion(agent_id='A1', new_prompt='first a1', reason='r', confidence=0.5),
+            PromptSuggestion(agent_id='A', new_prompt='new a', reason='r', confidence=0.9),
+            PromptSuggestion(agent_id='A1', new_prompt='new a1', reason='r', confidence=0.8)
+        ]
+        updater = PromptUpdater()
+        updated, applied = updater.apply_suggestions(config, suggestions)
+
+        self.assertEqual(applied, suggestions)
+        changes = updater.update_history[-1]['changes']
+        self.assertEqual([change['agent_id'] for change in changes], ['A1', 'A', 'A1'])
+        self.assertEqual(changes[2]['old_hash'], PromptUpdater._prompt_digest('first a1'))
+        self.assertEqual(AgentConfigUpdater.extract_agent_prompts(updated),
+                         {'Root': 'root', 'A': 'new a', 'A1': 'new a1', 'B': 'b'})
+        self.assertIs(updated['sub_agents'][1], config['sub_agents'][1])
+        self.assertEqual(config, make_config())
+
+    def test_validation_reports_errors_in_declaration_order(self):
+        """Structure errors and repeated ancestor names are reported, in declaration order."""
+        config = make_config()
+        config['sub_agents'][0]['sub_agents'].append({'name': 'A'})
+        config['sub_agents'].append('not an agent')
+        is_valid, errors = PromptUpdater().validate_configuration(config)
+
+        self.assertFalse(is_valid)
+        self.assertEqual(errors, [
+            "Agent root.sub_agents[0].sub_agents[1] missing 'class' field",
+            "Agent root.sub_agents[0].sub_agents[1] missing 'module' field",
+            "Agent at root.sub_agents[2] must be a dictionary",
+            "Circular reference detected: Root -> A -> A"
+        ])
+
+    def test_empty_prompts_reported_after_structure_errors(self):
+        """Blank prompts are reported once per agent name, after structure errors."""
+        config = make_config()
+        config['instruction'] = '  '
+        config['sub_agents'][1]['instruction'] = ''
+        config['sub_agents'][1].pop('module')
+
+        self.assertEqual(PromptUpdater().validate_configuration(config), (False, [
+            "Agent root.sub_agents[1] missing 'module' field",
+            "Empty prompt for agent: Root",
+            "Empty prompt for agent: B"
+        ]))
+
+    def test_deeply_nested_config_does_not_hit_recursion_limit(self):
+        """Walkers should handle nesting deeper than the interpreter recursion limit."""
+        depth = sys.getrecursionlimit() + 100
+        config = {'name': 'Agent0', 'class': 'LlmAgent', 'module': 'core', 'instruction': 'p0'}
+        leaf = config
+        for i in range(1, depth):
+            child = {'name': f'Agent{i}', 'class': 'LlmAgent', 'module': 'core', 'instruction': f'p{i}'}
+            leaf['sub_agents'] = [child]
+            leaf = child
+
+        updater = PromptUpdater()
+        self.assertEqual(updater.validate_configuration(config), (True, []))
+        self.assertEqual(len(AgentConfigUpdater.extract_agent_prompts(config)), depth)
+
+    def test_prompt_diff_covers_changed_added_and_removed_agents(self):
+        """Only prompts that differ between configs should appear in the diff."""
+        old_config = make_config()
+        new_config = make_config()
+        new_config['sub_agents'][1]['instruction'] = 'better b'
+        new_config['sub_agents'][0]['sub_agents'] = [{'name': 'A2', 'instruction': 'a2'}]
+
+        self.assertEqual(PromptUpdater().get_prompt_diff(old_config, new_config), {
+            'A1': {'old': 'a1', 'new': ''},
+            'B': {'old': 'b', 'new': 'better b'},
+            'A2': {'old': '', 'new': 'a2'}
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
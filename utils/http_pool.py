@@ -0,0 +1,68 @@
+"""
+HTTP connection pooling for LiteLLM.
+
+Every agent model call goes through LiteLLM. Giving it one long-lived, pooled
+httpx.AsyncClient keeps connections to the provider alive between calls, so
+only the first request to a host pays for the TCP and TLS handshake.
+
+httpx connections belong to the event loop that opened them, so the pool is
+installed lazily from async code and replaced when a new loop starts (e.g. on
+each asyncio.run call).
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+    import litellm
+    HTTP_POOL_AVAILABLE = True
+except ImportError:
+    HTTP_POOL_AVAILABLE = False
+
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 50
+REQUEST_TIMEOUT = 60.0
+CONNECT_TIMEOUT = 10.0
+
+# The client this module installed and the event loop it was created on
+_pool_client = None
+_pool_loop = None
+
+
+def configure_litellm_http_pool() -> bool:
+    """
+    Install a shared pooled async HTTP client for LiteLLM on the running event loop.
+
+    A client installed for an earlier loop is replaced; a client set by the caller
+    is kept. Outside a running event loop nothing is installed.
+
+    Returns:
+        bool: True if LiteLLM has a shared async client after the call
+    """
+    global _pool_client, _pool_loop
+
+    if not HTTP_POOL_AVAILABLE:
+        return False
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+
+    session = litellm.aclient_session
+    if session is not None and (session is not _pool_client or _pool_loop is loop):
+        return True
+
+    _pool_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+    )
+    _pool_loop = loop
+    litellm.aclient_session = _pool_client
+    logger.debug("Configured pooled httpx client for LiteLLM")
+    return True